@@ -1,22 +1,43 @@
 #!/usr/bin/env python3
 """Analyze clue prediction data and generate statistics."""
 
-import json
+import argparse
+import os
+import pickle
+import tempfile
 from pathlib import Path
+from typing import Annotated, NamedTuple
 
+import kaleido
+import numpy as np
 import plotly.graph_objects as go
-from pydantic import BaseModel, TypeAdapter
+import plotly.io as pio
+from plotly.offline import get_plotlyjs_version
+from pydantic import BaseModel, BeforeValidator, Field, TypeAdapter
 
-from generate_serialized_game import SerializedGame
+# Above this many points, confidence-vs-propositions panels are drawn as a
+# binned density heatmap instead of one marker per prediction
+SCATTER_MAX_POINTS = 5000
+DENSITY_BINS = (50, 20)  # (propositions, confidence)
 
+# Layout settings shared by every chart
+CHART_LAYOUT = {"height": 400, "showlegend": True}
 
+# Confidence is bucketed into ten 10%-wide bins (0-10%, 10-20%, ...)
+CONFIDENCE_BIN_MIDPOINTS = tuple((i * 10 + (i + 1) * 10) / 2 / 100 for i in range(10))
+CONFIDENCE_BIN_LABELS = tuple(f"{i * 10}-{(i + 1) * 10}%" for i in range(10))
+
+# Number of headless-Chrome tabs Kaleido renders PNGs in concurrently
+KALEIDO_TABS = 4
+
+
+# Parsed prediction models are read-only by convention; they are not frozen
+# because they are consumed straight away by calculate_statistics.
 class PredictionMetadata(BaseModel):
     """Metadata for a prediction."""
 
     model: str
 
-    model_config = {"frozen": True}
-
 
 class PredictionData(BaseModel):
     """Prediction result data."""
@@ -26,33 +47,38 @@ class PredictionData(BaseModel):
     confidence: float
     metadata: PredictionMetadata
 
-    model_config = {"frozen": True}
 
+class GameSize(BaseModel):
+    """Size of a serialized game; the only part of the game the analytics need.
 
-class PredictionEntry(BaseModel):
-    """Complete prediction entry with game and prediction data."""
-
-    game: SerializedGame
-    predictionData: PredictionData
-
-    model_config = {"frozen": True}
+    Lists are reduced to their length while parsing, so the full
+    SerializedGame (propositions, ground truth, ...) is never built.
+    """
 
+    num_suspects: Annotated[int, BeforeValidator(len)] = Field(validation_alias="names")
+    num_propositions: Annotated[int, BeforeValidator(len)] = Field(
+        validation_alias="propositions"
+    )
 
-class ConfidenceBin(BaseModel):
-    """Confidence bin statistics."""
 
-    correct: int = 0
-    total: int = 0
+class PredictionEntry(BaseModel):
+    """Prediction entry with game size and prediction data."""
 
+    game: GameSize
+    predictionData: PredictionData
 
-class PropsVsConfidence(BaseModel):
-    """Data point for propositions vs confidence analysis."""
 
-    num_props: int
-    confidence: float
-    is_correct: bool
+class PropsVsConfidence(NamedTuple):
+    """Parallel arrays for propositions vs confidence analysis (one row per prediction)."""
 
-    model_config = {"frozen": True}
+    num_props: np.ndarray
+    confidence: np.ndarray
+    is_correct: np.ndarray
+    # Accurate/inaccurate subsets, split once so chart builders don't re-mask
+    accurate_props: np.ndarray
+    accurate_confidence: np.ndarray
+    inaccurate_props: np.ndarray
+    inaccurate_confidence: np.ndarray
 
 
 class Statistics(BaseModel):
@@ -60,9 +86,15 @@ class Statistics(BaseModel):
 
     avg_confidence_accurate: float
     avg_confidence_inaccurate: float
-    confidence_bins: dict[int, ConfidenceBin]
-    bin_accuracy: dict[int, float]
-    props_vs_confidence: list[PropsVsConfidence]
+    median_conf_accurate: float
+    median_conf_inaccurate: float
+    avg_props_accurate: float
+    avg_props_inaccurate: float
+    # Per confidence bin (index 0 = 0-10%, ..., 9 = 90-100%)
+    bin_totals: np.ndarray
+    bin_correct: np.ndarray
+    bin_accuracy: np.ndarray
+    props_vs_confidence: PropsVsConfidence
     total_predictions: int
     total_accurate: int
     total_inaccurate: int
@@ -72,416 +104,496 @@ class Statistics(BaseModel):
     model_config = {"arbitrary_types_allowed": True}
 
 
+# Built once at import; constructing a TypeAdapter compiles its core schema
+PREDICTIONS_ADAPTER = TypeAdapter(list[PredictionEntry])
+
+
 def load_predictions(json_path: Path) -> list[PredictionEntry]:
     """Load and validate predictions from JSON file."""
-    with open(json_path) as f:
-        raw_data = json.load(f)
-
-    # Validate data with Pydantic
-    adapter = TypeAdapter(list[PredictionEntry])
-    return adapter.validate_python(raw_data)
+    # Parse and validate in one pass with pydantic-core's JSON parser rather
+    # than building an intermediate dict graph with json.load
+    return PREDICTIONS_ADAPTER.validate_json(json_path.read_bytes())
 
 
 def calculate_statistics(predictions: list[PredictionEntry]) -> Statistics:
     """Calculate statistics from prediction data."""
-    # Separate accurate and inaccurate predictions
-    accurate_preds: list[float] = []
-    inaccurate_preds: list[float] = []
-
-    # Confidence bins (0-10%, 10-20%, etc.)
-    confidence_bins: dict[int, ConfidenceBin] = {
-        i: ConfidenceBin(correct=0, total=0) for i in range(10)
-    }
-
-    # Track confidence vs number of propositions
-    props_vs_confidence: list[PropsVsConfidence] = []
-
-    # Track number of suspects per game
-    num_suspects_per_game: list[int] = []
-
-    for entry in predictions:
-        pred_data = entry.predictionData
-        game_data = entry.game
-
-        confidence = pred_data.confidence
-        is_correct = pred_data.correctness
-        num_propositions = len(game_data.propositions)
-        num_suspects = len(game_data.names)
-
-        # Track number of suspects
-        num_suspects_per_game.append(num_suspects)
-
-        # Separate by accuracy
-        if is_correct:
-            accurate_preds.append(confidence)
-        else:
-            inaccurate_preds.append(confidence)
-
-        # Bin by confidence (0-10%, 10-20%, etc.)
-        bin_idx = min(int(confidence * 10), 9)
-        confidence_bins[bin_idx].total += 1
-        if is_correct:
-            confidence_bins[bin_idx].correct += 1
-
-        # Track propositions vs confidence and accuracy
-        props_vs_confidence.append(
-            PropsVsConfidence(
-                num_props=num_propositions,
-                confidence=confidence,
-                is_correct=is_correct,
-            )
-        )
+    n = len(predictions)
+
+    # Extract parallel arrays in one pass so everything below is vectorized
+    confidence = np.empty(n, dtype=np.float64)
+    is_correct = np.empty(n, dtype=np.bool_)
+    num_props = np.empty(n, dtype=np.int32)
+    num_suspects = np.empty(n, dtype=np.int32)
+    for i, entry in enumerate(predictions):
+        confidence[i] = entry.predictionData.confidence
+        is_correct[i] = entry.predictionData.correctness
+        num_props[i] = entry.game.num_propositions
+        num_suspects[i] = entry.game.num_suspects
+
+    accurate_preds = confidence[is_correct]
+    inaccurate_preds = confidence[~is_correct]
+    accurate_props = num_props[is_correct]
+    inaccurate_props = num_props[~is_correct]
 
     # Calculate average confidence
-    avg_confidence_accurate = (
-        sum(accurate_preds) / len(accurate_preds) if accurate_preds else 0
-    )
+    avg_confidence_accurate = float(accurate_preds.mean()) if accurate_preds.size else 0
     avg_confidence_inaccurate = (
-        sum(inaccurate_preds) / len(inaccurate_preds) if inaccurate_preds else 0
+        float(inaccurate_preds.mean()) if inaccurate_preds.size else 0
     )
 
+    # Confidence bins (0-10%, 10-20%, etc.)
+    bin_idx = np.minimum((confidence * 10).astype(np.int32), 9)
+    bin_totals = np.bincount(bin_idx, minlength=10)
+    bin_correct = np.bincount(bin_idx[is_correct], minlength=10)
+
     # Calculate accuracy rates by confidence bin
-    bin_accuracy: dict[int, float] = {}
-    for bin_idx, data in confidence_bins.items():
-        if data.total > 0:
-            bin_accuracy[bin_idx] = data.correct / data.total
-        else:
-            bin_accuracy[bin_idx] = 0
+    bin_accuracy = np.divide(
+        bin_correct, bin_totals, out=np.zeros(10), where=bin_totals > 0
+    )
 
-    # Calculate average number of suspects and random chance accuracy
-    avg_num_suspects = (
-        sum(num_suspects_per_game) / len(num_suspects_per_game)
-        if num_suspects_per_game
-        else 0
+    # Track propositions vs confidence and accuracy
+    props_vs_confidence = PropsVsConfidence(
+        num_props=num_props,
+        confidence=confidence,
+        is_correct=is_correct,
+        accurate_props=accurate_props,
+        accurate_confidence=accurate_preds,
+        inaccurate_props=inaccurate_props,
+        inaccurate_confidence=inaccurate_preds,
+    )
+
+    # Medians of confidence and mean proposition counts by accuracy
+    median_conf_accurate = (
+        float(np.median(accurate_preds)) if accurate_preds.size else 0
+    )
+    median_conf_inaccurate = (
+        float(np.median(inaccurate_preds)) if inaccurate_preds.size else 0
     )
+    avg_props_accurate = float(accurate_props.mean()) if accurate_props.size else 0
+    avg_props_inaccurate = (
+        float(inaccurate_props.mean()) if inaccurate_props.size else 0
+    )
+
+    # Calculate average number of suspects and random chance accuracy
+    avg_num_suspects = float(num_suspects.mean()) if n else 0
     random_chance_accuracy = 1.0 / avg_num_suspects if avg_num_suspects > 0 else 0
 
     return Statistics(
         avg_confidence_accurate=avg_confidence_accurate,
         avg_confidence_inaccurate=avg_confidence_inaccurate,
-        confidence_bins=confidence_bins,
+        median_conf_accurate=median_conf_accurate,
+        median_conf_inaccurate=median_conf_inaccurate,
+        avg_props_accurate=avg_props_accurate,
+        avg_props_inaccurate=avg_props_inaccurate,
+        bin_totals=bin_totals,
+        bin_correct=bin_correct,
         bin_accuracy=bin_accuracy,
         props_vs_confidence=props_vs_confidence,
-        total_predictions=len(predictions),
-        total_accurate=len(accurate_preds),
-        total_inaccurate=len(inaccurate_preds),
+        total_predictions=n,
+        total_accurate=int(accurate_preds.size),
+        total_inaccurate=int(inaccurate_preds.size),
         avg_num_suspects=avg_num_suspects,
         random_chance_accuracy=random_chance_accuracy,
     )
 
 
-def create_avg_confidence_chart(stats: Statistics, output_dir: Path) -> str:
-    """Create average confidence bar chart."""
-    fig = go.Figure()
-    fig.add_trace(
-        go.Bar(
-            x=["Accurate", "Inaccurate"],
-            y=[stats.avg_confidence_accurate, stats.avg_confidence_inaccurate],
-            text=[
-                f"{stats.avg_confidence_accurate:.3f}",
-                f"{stats.avg_confidence_inaccurate:.3f}",
-            ],
-            textposition="auto",
-            marker_color=["green", "red"],
-            name="Avg Confidence",
+def props_confidence_trace(
+    props: np.ndarray,
+    confs: np.ndarray,
+    *,
+    color: str,
+    size: int,
+    opacity: float,
+    name: str,
+) -> go.Scattergl | go.Heatmap:
+    """Build a confidence-vs-propositions trace, binning it when there are many points.
+
+    Plotted values are down-cast to float32: Plotly embeds ndarrays as base64
+    typed arrays, so this halves the payload and is ample for 3-decimal hovers.
+    """
+    if props.size < SCATTER_MAX_POINTS:
+        return go.Scattergl(
+            x=props,
+            y=confs.astype(np.float32),
+            mode="markers",
+            marker=dict(color=color, size=size, opacity=opacity),
+            name=name,
+            hovertemplate="Propositions: %{x}<br>Confidence: %{y:.3f}<extra></extra>",
         )
-    )
-    fig.update_layout(
-        title="Average Confidence: Accurate vs Inaccurate",
-        yaxis_title="Confidence",
-        height=400,
-        showlegend=True,
-    )
 
-    # Save individual files
-    fig.write_html(output_dir / "avg_confidence.html")
-    fig.write_image(output_dir / "avg_confidence.png")
+    counts, prop_edges, conf_edges = np.histogram2d(props, confs, bins=DENSITY_BINS)
+    # Heatmaps have no legend entry, so the colorbar carries the trace's name
+    return go.Heatmap(
+        z=counts.T,
+        x=prop_edges,
+        y=conf_edges,
+        colorscale=[[0.0, "white"], [1.0, color]],
+        colorbar=dict(title=dict(text=f"{name}<br>(count)")),
+        name=name,
+        hovertemplate="Propositions: %{x:.0f}<br>Confidence: %{y:.3f}<br>Count: %{z}<extra></extra>",
+    )
 
-    return fig.to_html(full_html=False, include_plotlyjs=False)
 
+def _stats_cache_key(predictions_path: Path) -> tuple[int, int, int]:
+    """Identify a predictions file (and the code that analyzes it) for caching."""
+    source = predictions_path.stat()
+    return (source.st_mtime_ns, source.st_size, Path(__file__).stat().st_mtime_ns)
+
+
+def load_or_calculate_statistics(
+    predictions_path: Path, cache_path: Path
+) -> Statistics:
+    """Return statistics for a predictions file, reusing a pickled copy if it is current."""
+    key = _stats_cache_key(predictions_path)
+    # The cache holds two pickles, the key and then the statistics, so a cache
+    # for another version is rejected before its payload is unpickled
+    try:
+        with open(cache_path, "rb") as f:
+            if pickle.load(f) == key:
+                cached_stats = pickle.load(f)
+                print(f"Using cached statistics from {cache_path}")
+                return cached_stats
+    except FileNotFoundError:
+        pass
+    except (
+        OSError,
+        EOFError,
+        pickle.UnpicklingError,
+        AttributeError,
+        ImportError,
+        ValueError,
+        IndexError,
+    ) as e:
+        # Truncated, or written by an older version of this module (e.g.
+        # referencing a class that no longer exists)
+        print(f"Stats cache unusable ({type(e).__name__}: {e}), recomputing")
 
-def create_calibration_curve(stats: Statistics, output_dir: Path) -> str:
-    """Create calibration curve showing predicted vs actual accuracy."""
-    bin_accuracies = [stats.bin_accuracy[i] for i in range(10)]
-    bin_totals = [stats.confidence_bins[i].total for i in range(10)]
-    bin_midpoints = [(i * 10 + (i + 1) * 10) / 2 / 100 for i in range(10)]
-
-    fig = go.Figure()
-
-    # Actual calibration
-    fig.add_trace(
-        go.Scatter(
-            x=bin_midpoints,
-            y=bin_accuracies,
-            mode="lines+markers",
-            marker=dict(size=10, color="blue"),
-            line=dict(color="blue", width=2),
-            name="Actual",
-            text=[f"n={total}" for total in bin_totals],
-            hovertemplate="Confidence: %{x:.1%}<br>Accuracy: %{y:.1%}<br>%{text}<extra></extra>",
-        )
-    )
+    print("Loading predictions...")
+    predictions = load_predictions(predictions_path)
 
-    fig.update_layout(
-        title="Calibration Curve: Predicted vs Actual",
-        xaxis_title="Predicted Confidence",
-        yaxis_title="Actual Accuracy",
-        height=400,
-        showlegend=True,
-    )
+    print("Calculating statistics...")
+    stats = calculate_statistics(predictions)
 
-    # Save individual files
-    fig.write_html(output_dir / "calibration_curve.html")
-    fig.write_image(output_dir / "calibration_curve.png")
+    # Write atomically so an interrupted run never leaves a truncated cache
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(stats, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        # Don't leave a half-written temp file behind (e.g. disk full)
+        os.unlink(tmp_path)
+        raise
 
-    return fig.to_html(full_html=False, include_plotlyjs=False)
+    return stats
 
 
-def create_accuracy_by_confidence_bin(stats: Statistics, output_dir: Path) -> str:
-    """Create bar chart of accuracy rate by confidence bin."""
-    bin_labels = [f"{i * 10}-{(i + 1) * 10}%" for i in range(10)]
-    bin_accuracies = [stats.bin_accuracy[i] for i in range(10)]
-    bin_totals = [stats.confidence_bins[i].total for i in range(10)]
-
-    fig = go.Figure()
-    fig.add_trace(
-        go.Bar(
-            x=bin_labels,
-            y=bin_accuracies,
-            text=[
-                f"{acc:.2%}<br>n={total}"
-                for acc, total in zip(bin_accuracies, bin_totals)
-            ],
-            textposition="auto",
-            marker_color="blue",
-            name="Accuracy Rate",
-        )
+def create_avg_confidence_chart(stats: Statistics) -> go.Figure:
+    """Create average confidence bar chart."""
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=["Accurate", "Inaccurate"],
+                y=[stats.avg_confidence_accurate, stats.avg_confidence_inaccurate],
+                text=[
+                    f"{stats.avg_confidence_accurate:.3f}",
+                    f"{stats.avg_confidence_inaccurate:.3f}",
+                ],
+                textposition="auto",
+                marker_color=["green", "red"],
+                name="Avg Confidence",
+            ),
+        ],
+        layout=dict(
+            title="Average Confidence: Accurate vs Inaccurate",
+            yaxis_title="Confidence",
+            **CHART_LAYOUT,
+        ),
     )
 
-    fig.update_layout(
-        title="Accuracy Rate by Confidence Bin",
-        xaxis_title="Confidence Bin",
-        yaxis_title="Accuracy Rate",
-        height=400,
-        showlegend=True,
-    )
+    return fig
 
-    # Save individual files
-    fig.write_html(output_dir / "accuracy_by_confidence_bin.html")
-    fig.write_image(output_dir / "accuracy_by_confidence_bin.png")
 
-    return fig.to_html(full_html=False, include_plotlyjs=False)
+def create_calibration_curve(stats: Statistics) -> go.Figure:
+    """Create calibration curve showing predicted vs actual accuracy."""
+    bin_accuracies = stats.bin_accuracy
+    bin_totals = stats.bin_totals.tolist()
+
+    fig = go.Figure(
+        data=[
+            go.Scatter(
+                x=CONFIDENCE_BIN_MIDPOINTS,
+                y=bin_accuracies,
+                mode="lines+markers",
+                marker=dict(size=10, color="blue"),
+                line=dict(color="blue", width=2),
+                name="Actual",
+                text=[f"n={total}" for total in bin_totals],
+                hovertemplate="Confidence: %{x:.1%}<br>Accuracy: %{y:.1%}<br>%{text}<extra></extra>",
+            ),
+        ],
+        layout=dict(
+            title="Calibration Curve: Predicted vs Actual",
+            xaxis_title="Predicted Confidence",
+            yaxis_title="Actual Accuracy",
+            **CHART_LAYOUT,
+        ),
+    )
 
+    return fig
 
-def create_confidence_distribution(stats: Statistics, output_dir: Path) -> str:
-    """Create box plot showing confidence distribution by accuracy."""
-    accurate_confidences = [
-        d.confidence for d in stats.props_vs_confidence if d.is_correct
-    ]
-    inaccurate_confidences = [
-        d.confidence for d in stats.props_vs_confidence if not d.is_correct
-    ]
 
-    fig = go.Figure()
-    fig.add_trace(
-        go.Box(
-            y=accurate_confidences,
-            name="Accurate",
-            marker_color="green",
-        )
+def create_accuracy_by_confidence_bin(stats: Statistics) -> go.Figure:
+    """Create bar chart of accuracy rate by confidence bin."""
+    bin_accuracies = stats.bin_accuracy
+    bin_totals = stats.bin_totals.tolist()
+
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=CONFIDENCE_BIN_LABELS,
+                y=bin_accuracies,
+                text=[
+                    f"{acc:.2%}<br>n={total}"
+                    for acc, total in zip(bin_accuracies, bin_totals)
+                ],
+                textposition="auto",
+                marker_color="blue",
+                name="Accuracy Rate",
+            ),
+        ],
+        layout=dict(
+            title="Accuracy Rate by Confidence Bin",
+            xaxis_title="Confidence Bin",
+            yaxis_title="Accuracy Rate",
+            **CHART_LAYOUT,
+        ),
     )
 
-    fig.add_trace(
-        go.Box(
-            y=inaccurate_confidences,
-            name="Inaccurate",
-            marker_color="red",
-        )
-    )
+    return fig
 
-    fig.update_layout(
-        title="Confidence Distribution by Accuracy",
-        yaxis_title="Confidence",
-        height=400,
-        showlegend=True,
-    )
 
-    # Save individual files
-    fig.write_html(output_dir / "confidence_distribution.html")
-    fig.write_image(output_dir / "confidence_distribution.png")
+def create_confidence_distribution(stats: Statistics) -> go.Figure:
+    """Create box plot showing confidence distribution by accuracy."""
+    pvc = stats.props_vs_confidence
+
+    fig = go.Figure(
+        data=[
+            go.Box(
+                y=pvc.accurate_confidence.astype(np.float32),
+                name="Accurate",
+                marker_color="green",
+            ),
+            go.Box(
+                y=pvc.inaccurate_confidence.astype(np.float32),
+                name="Inaccurate",
+                marker_color="red",
+            ),
+        ],
+        layout=dict(
+            title="Confidence Distribution by Accuracy",
+            yaxis_title="Confidence",
+            **CHART_LAYOUT,
+        ),
+    )
 
-    return fig.to_html(full_html=False, include_plotlyjs=False)
+    return fig
 
 
-def create_accuracy_by_propositions(stats: Statistics, output_dir: Path) -> str:
+def create_accuracy_by_propositions(stats: Statistics) -> go.Figure:
     """Create bar chart of accuracy rate by number of propositions."""
-    # Bin by tens of propositions
-    props_bins: dict[int, dict[str, int]] = {}
-    for d in stats.props_vs_confidence:
-        n = d.num_props
-        # Bin into 0-10, 10-20, etc.
-        bin_idx = n // 10
-        if bin_idx not in props_bins:
-            props_bins[bin_idx] = {"correct": 0, "total": 0}
-        props_bins[bin_idx]["total"] += 1
-        if d.is_correct:
-            props_bins[bin_idx]["correct"] += 1
-
-    # Sort bins and create labels
-    sorted_bin_indices = sorted(props_bins.keys())
-    bin_labels = [f"{i * 10}-{(i + 1) * 10}" for i in sorted_bin_indices]
-    accuracy_rates = [
-        props_bins[i]["correct"] / props_bins[i]["total"] for i in sorted_bin_indices
-    ]
-    totals = [props_bins[i]["total"] for i in sorted_bin_indices]
-
-    fig = go.Figure()
-    fig.add_trace(
-        go.Bar(
-            x=bin_labels,
-            y=accuracy_rates,
-            text=[
-                f"{acc:.2%}<br>n={total}" for acc, total in zip(accuracy_rates, totals)
-            ],
-            textposition="auto",
-            marker_color="purple",
-            name="Accuracy Rate",
-        )
-    )
-
-    fig.update_layout(
-        title="Accuracy by Number of Propositions",
-        xaxis_title="Number of Propositions",
-        yaxis_title="Accuracy Rate",
-        height=400,
-        showlegend=True,
+    # Bin by tens of propositions (0-10, 10-20, etc.)
+    pvc = stats.props_vs_confidence
+    props_bin_idx = pvc.num_props // 10
+    bin_totals = np.bincount(props_bin_idx)
+    bin_correct = np.bincount(props_bin_idx[pvc.is_correct], minlength=bin_totals.size)
+
+    # Keep only non-empty bins, in sorted order
+    sorted_bin_indices = np.flatnonzero(bin_totals)
+    bin_labels = [f"{i * 10}-{(i + 1) * 10}" for i in sorted_bin_indices.tolist()]
+    accuracy_rates = (
+        bin_correct[sorted_bin_indices] / bin_totals[sorted_bin_indices]
+    ).tolist()
+    totals = bin_totals[sorted_bin_indices].tolist()
+
+    fig = go.Figure(
+        data=[
+            go.Bar(
+                x=bin_labels,
+                y=accuracy_rates,
+                text=[
+                    f"{acc:.2%}<br>n={total}"
+                    for acc, total in zip(accuracy_rates, totals)
+                ],
+                textposition="auto",
+                marker_color="purple",
+                name="Accuracy Rate",
+            ),
+        ],
+        layout=dict(
+            title="Accuracy by Number of Propositions",
+            xaxis_title="Number of Propositions",
+            yaxis_title="Accuracy Rate",
+            **CHART_LAYOUT,
+        ),
     )
 
-    # Save individual files
-    fig.write_html(output_dir / "accuracy_by_propositions.html")
-    fig.write_image(output_dir / "accuracy_by_propositions.png")
+    return fig
 
-    return fig.to_html(full_html=False, include_plotlyjs=False)
 
-
-def create_confidence_vs_propositions_all(stats: Statistics, output_dir: Path) -> str:
+def create_confidence_vs_propositions_all(stats: Statistics) -> go.Figure:
     """Create scatter plot of confidence vs propositions for all predictions."""
-    all_props = [d.num_props for d in stats.props_vs_confidence]
-    all_confs = [d.confidence for d in stats.props_vs_confidence]
-
-    fig = go.Figure()
-    fig.add_trace(
-        go.Scatter(
-            x=all_props,
-            y=all_confs,
-            mode="markers",
-            marker=dict(color="blue", size=4, opacity=0.4),
-            name="All Predictions",
-            hovertemplate="Propositions: %{x}<br>Confidence: %{y:.3f}<extra></extra>",
-        )
+    all_props = stats.props_vs_confidence.num_props
+    all_confs = stats.props_vs_confidence.confidence
+
+    fig = go.Figure(
+        data=[
+            props_confidence_trace(
+                all_props,
+                all_confs,
+                color="blue",
+                size=4,
+                opacity=0.4,
+                name="All Predictions",
+            ),
+        ],
+        layout=dict(
+            title="Confidence vs Number of Propositions",
+            xaxis_title="Number of Propositions",
+            yaxis_title="Confidence",
+            **CHART_LAYOUT,
+        ),
     )
 
-    fig.update_layout(
-        title="Confidence vs Number of Propositions",
-        xaxis_title="Number of Propositions",
-        yaxis_title="Confidence",
-        height=400,
-        showlegend=True,
-    )
-
-    # Save individual files
-    fig.write_html(output_dir / "confidence_vs_propositions_all.html")
-    fig.write_image(output_dir / "confidence_vs_propositions_all.png")
+    return fig
 
-    return fig.to_html(full_html=False, include_plotlyjs=False)
 
-
-def create_confidence_vs_propositions_accurate(
-    stats: Statistics, output_dir: Path
-) -> str:
+def create_confidence_vs_propositions_accurate(stats: Statistics) -> go.Figure:
     """Create scatter plot of confidence vs propositions for accurate predictions."""
-    accurate_props = [d.num_props for d in stats.props_vs_confidence if d.is_correct]
-    accurate_confs = [d.confidence for d in stats.props_vs_confidence if d.is_correct]
-
-    fig = go.Figure()
-    fig.add_trace(
-        go.Scatter(
-            x=accurate_props,
-            y=accurate_confs,
-            mode="markers",
-            marker=dict(color="green", size=5, opacity=0.6),
-            name="Accurate",
-            hovertemplate="Propositions: %{x}<br>Confidence: %{y:.3f}<extra></extra>",
-        )
-    )
-
-    fig.update_layout(
-        title="Confidence vs Propositions (Accurate)",
-        xaxis_title="Number of Propositions",
-        yaxis_title="Confidence",
-        height=400,
-        showlegend=True,
+    pvc = stats.props_vs_confidence
+
+    fig = go.Figure(
+        data=[
+            props_confidence_trace(
+                pvc.accurate_props,
+                pvc.accurate_confidence,
+                color="green",
+                size=5,
+                opacity=0.6,
+                name="Accurate",
+            ),
+        ],
+        layout=dict(
+            title="Confidence vs Propositions (Accurate)",
+            xaxis_title="Number of Propositions",
+            yaxis_title="Confidence",
+            **CHART_LAYOUT,
+        ),
     )
 
-    # Save individual files
-    fig.write_html(output_dir / "confidence_vs_propositions_accurate.html")
-    fig.write_image(output_dir / "confidence_vs_propositions_accurate.png")
-
-    return fig.to_html(full_html=False, include_plotlyjs=False)
+    return fig
 
 
-def create_confidence_vs_propositions_inaccurate(
-    stats: Statistics, output_dir: Path
-) -> str:
+def create_confidence_vs_propositions_inaccurate(stats: Statistics) -> go.Figure:
     """Create scatter plot of confidence vs propositions for inaccurate predictions."""
-    inaccurate_props = [
-        d.num_props for d in stats.props_vs_confidence if not d.is_correct
-    ]
-    inaccurate_confs = [
-        d.confidence for d in stats.props_vs_confidence if not d.is_correct
-    ]
-
-    fig = go.Figure()
-    fig.add_trace(
-        go.Scatter(
-            x=inaccurate_props,
-            y=inaccurate_confs,
-            mode="markers",
-            marker=dict(color="red", size=5, opacity=0.6),
-            name="Inaccurate",
-            hovertemplate="Propositions: %{x}<br>Confidence: %{y:.3f}<extra></extra>",
-        )
+    pvc = stats.props_vs_confidence
+
+    fig = go.Figure(
+        data=[
+            props_confidence_trace(
+                pvc.inaccurate_props,
+                pvc.inaccurate_confidence,
+                color="red",
+                size=5,
+                opacity=0.6,
+                name="Inaccurate",
+            ),
+        ],
+        layout=dict(
+            title="Confidence vs Propositions (Inaccurate)",
+            xaxis_title="Number of Propositions",
+            yaxis_title="Confidence",
+            **CHART_LAYOUT,
+        ),
     )
 
-    fig.update_layout(
-        title="Confidence vs Propositions (Inaccurate)",
-        xaxis_title="Number of Propositions",
-        yaxis_title="Confidence",
-        height=400,
-        showlegend=True,
-    )
+    return fig
+
+
+# Chart builders, keyed by the file name each chart is saved under
+CHART_BUILDERS = {
+    "avg_confidence": create_avg_confidence_chart,
+    "calibration_curve": create_calibration_curve,
+    "accuracy_by_confidence_bin": create_accuracy_by_confidence_bin,
+    "confidence_distribution": create_confidence_distribution,
+    "accuracy_by_propositions": create_accuracy_by_propositions,
+    "confidence_vs_propositions_all": create_confidence_vs_propositions_all,
+    "confidence_vs_propositions_accurate": create_confidence_vs_propositions_accurate,
+    "confidence_vs_propositions_inaccurate": create_confidence_vs_propositions_inaccurate,
+}
+
+
+def output_files(output_path: Path, save_individual_html: bool = False) -> list[Path]:
+    """List every file create_visualization writes.
+
+    That is the combined HTML page and each chart's PNG, plus each chart's own
+    HTML page when save_individual_html is set.
+    """
+    extensions = ("png", "html") if save_individual_html else ("png",)
+    return [output_path] + [
+        output_path.parent / f"{name}.{ext}"
+        for name in CHART_BUILDERS
+        for ext in extensions
+    ]
 
-    # Save individual files
-    fig.write_html(output_dir / "confidence_vs_propositions_inaccurate.html")
-    fig.write_image(output_dir / "confidence_vs_propositions_inaccurate.png")
 
-    return fig.to_html(full_html=False, include_plotlyjs=False)
+def save_charts(
+    figures: dict[str, go.Figure], output_dir: Path, save_individual_html: bool = False
+) -> None:
+    """Save each chart as a PNG (and optionally standalone HTML) in output_dir.
+
+    All PNGs are rendered in one batch. If Kaleido's sync server is running
+    (see main) they reuse its warm Chrome and parallel tabs; otherwise
+    Kaleido starts a one-off browser for the batch. The combined analytics page embeds every
+    chart itself, so per-chart HTML files are only written on request.
+    """
+    if save_individual_html:
+        for name, fig in figures.items():
+            fig.write_html(
+                output_dir / f"{name}.html", include_plotlyjs="cdn", validate=False
+            )
 
+    # write_images ignores the layout size, so pass the chart height explicitly
+    pio.write_images(
+        list(figures.values()),
+        [output_dir / f"{name}.png" for name in figures],
+        height=CHART_LAYOUT["height"],
+        validate=False,
+    )
 
-def create_visualization(stats: Statistics, output_path: Path) -> None:
+
+def create_visualization(
+    stats: Statistics, output_path: Path, save_individual_html: bool = False
+) -> None:
     """Create HTML visualization with all statistics."""
     # Get output directory for individual chart files
     output_dir = output_path.parent
 
-    # Generate all chart HTML (also saves individual files)
-    chart1 = create_avg_confidence_chart(stats, output_dir)
-    chart2 = create_calibration_curve(stats, output_dir)
-    chart3 = create_accuracy_by_confidence_bin(stats, output_dir)
-    chart4 = create_confidence_distribution(stats, output_dir)
-    chart5 = create_accuracy_by_propositions(stats, output_dir)
-    chart6 = create_confidence_vs_propositions_all(stats, output_dir)
-    chart7 = create_confidence_vs_propositions_accurate(stats, output_dir)
-    chart8 = create_confidence_vs_propositions_inaccurate(stats, output_dir)
+    # Build all charts, keyed by the file name they are saved under
+    figures = {name: build(stats) for name, build in CHART_BUILDERS.items()}
+    save_charts(figures, output_dir, save_individual_html=save_individual_html)
+
+    # Embed each figure as bare JSON; one script below plots them all. The
+    # "</" escape keeps figure text from closing the <script> element early.
+    figures_json = ",\n".join(
+        f'"{name}": {pio.to_json(fig, validate=False)}'.replace("</", "<\\/")
+        for name, fig in figures.items()
+    )
+    chart_divs = "\n".join(
+        f'        <div class="chart-container"><div id="{name}"></div></div>'
+        for name in figures
+    )
 
     # Calculate summary statistics
     overall_accuracy = stats.total_accurate / stats.total_predictions
@@ -493,7 +605,7 @@ def create_visualization(stats: Statistics, output_path: Path) -> None:
 <head>
     <meta charset="utf-8">
     <title>Clue Prediction Analytics</title>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    <script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>
     <style>
         body {{
             font-family: Arial, sans-serif;
@@ -539,15 +651,16 @@ def create_visualization(stats: Statistics, output_path: Path) -> None:
     </div>
 
     <div class="charts-grid">
-        <div class="chart-container">{chart1}</div>
-        <div class="chart-container">{chart2}</div>
-        <div class="chart-container">{chart3}</div>
-        <div class="chart-container">{chart4}</div>
-        <div class="chart-container">{chart5}</div>
-        <div class="chart-container">{chart6}</div>
-        <div class="chart-container">{chart7}</div>
-        <div class="chart-container">{chart8}</div>
+{chart_divs}
     </div>
+    <script>
+        const FIGURES = {{
+{figures_json}
+        }};
+        for (const [id, fig] of Object.entries(FIGURES)) {{
+            Plotly.newPlot(id, fig.data, fig.layout, {{ responsive: true }});
+        }}
+    </script>
 </body>
 </html>
 """
@@ -558,110 +671,133 @@ def create_visualization(stats: Statistics, output_path: Path) -> None:
 
     print(f"Visualization saved to {output_path}")
 
-    # Calculate additional statistics
-    import statistics
-
-    accurate_confidences = [
-        d.confidence for d in stats.props_vs_confidence if d.is_correct
-    ]
-    inaccurate_confidences = [
-        d.confidence for d in stats.props_vs_confidence if not d.is_correct
-    ]
-    accurate_props = [d.num_props for d in stats.props_vs_confidence if d.is_correct]
-    inaccurate_props = [
-        d.num_props for d in stats.props_vs_confidence if not d.is_correct
-    ]
-
-    median_conf_accurate = statistics.median(accurate_confidences)
-    median_conf_inaccurate = statistics.median(inaccurate_confidences)
-    avg_props_accurate = statistics.mean(accurate_props) if accurate_props else 0
-    avg_props_inaccurate = statistics.mean(inaccurate_props) if inaccurate_props else 0
-
-    # Print summary statistics
-    print("\n" + "=" * 60)
-    print("SUMMARY STATISTICS")
-    print("=" * 60)
+    # Build the summary and write it in one go
+    lines: list[str] = []
+    lines.append("\n" + "=" * 60)
+    lines.append("SUMMARY STATISTICS")
+    lines.append("=" * 60)
 
-    print(f"\nTotal predictions: {stats.total_predictions}")
-    print(
+    lines.append(f"\nTotal predictions: {stats.total_predictions}")
+    lines.append(
         f"Accurate predictions: {stats.total_accurate} ({stats.total_accurate / stats.total_predictions:.1%})"
     )
-    print(
+    lines.append(
         f"Inaccurate predictions: {stats.total_inaccurate} ({stats.total_inaccurate / stats.total_predictions:.1%})"
     )
-    print(f"\nAverage number of suspects per game: {stats.avg_num_suspects:.2f}")
-    print(f"Random chance accuracy: {stats.random_chance_accuracy:.1%}")
-
-    print("\n" + "-" * 60)
-    print("CONFIDENCE ANALYSIS")
-    print("-" * 60)
-    print(f"Average confidence when accurate:   {stats.avg_confidence_accurate:.4f}")
-    print(f"Average confidence when inaccurate: {stats.avg_confidence_inaccurate:.4f}")
-    print(
+    lines.append(f"\nAverage number of suspects per game: {stats.avg_num_suspects:.2f}")
+    lines.append(f"Random chance accuracy: {stats.random_chance_accuracy:.1%}")
+
+    lines.append("\n" + "-" * 60)
+    lines.append("CONFIDENCE ANALYSIS")
+    lines.append("-" * 60)
+    lines.append(
+        f"Average confidence when accurate:   {stats.avg_confidence_accurate:.4f}"
+    )
+    lines.append(
+        f"Average confidence when inaccurate: {stats.avg_confidence_inaccurate:.4f}"
+    )
+    lines.append(
         f"Difference (accurate - inaccurate): {stats.avg_confidence_accurate - stats.avg_confidence_inaccurate:+.4f}"
     )
-    print(f"\nMedian confidence when accurate:    {median_conf_accurate:.4f}")
-    print(f"Median confidence when inaccurate:  {median_conf_inaccurate:.4f}")
-    print(
-        f"Difference (accurate - inaccurate): {median_conf_accurate - median_conf_inaccurate:+.4f}"
-    )
-
-    print("\n" + "-" * 60)
-    print("PROPOSITIONS ANALYSIS")
-    print("-" * 60)
-    print(f"Average propositions when accurate:   {avg_props_accurate:.2f}")
-    print(f"Average propositions when inaccurate: {avg_props_inaccurate:.2f}")
-    print(
-        f"Difference (accurate - inaccurate):   {avg_props_accurate - avg_props_inaccurate:+.2f}"
-    )
-
-    print("\n" + "-" * 60)
-    print("CALIBRATION ANALYSIS")
-    print("-" * 60)
-    # Find bins with worst calibration
-    calibration_errors = []
-    for i in range(10):
-        if stats.confidence_bins[i].total > 0:
-            midpoint = (i * 10 + (i + 1) * 10) / 2 / 100
-            actual = stats.bin_accuracy[i]
-            error = abs(midpoint - actual)
-            calibration_errors.append(
-                (i, midpoint, actual, error, stats.confidence_bins[i].total)
-            )
+    lines.append(
+        f"\nMedian confidence when accurate:    {stats.median_conf_accurate:.4f}"
+    )
+    lines.append(
+        f"Median confidence when inaccurate:  {stats.median_conf_inaccurate:.4f}"
+    )
+    lines.append(
+        f"Difference (accurate - inaccurate): {stats.median_conf_accurate - stats.median_conf_inaccurate:+.4f}"
+    )
 
-    calibration_errors.sort(key=lambda x: x[3], reverse=True)
-    print("Top 3 worst-calibrated bins:")
-    for i, (bin_idx, predicted, actual, error, count) in enumerate(
-        calibration_errors[:3], 1
-    ):
-        print(
-            f"  {i}. Bin {bin_idx * 10}-{(bin_idx + 1) * 10}%: predicted {predicted:.1%}, actual {actual:.1%}, "
-            f"error {error:.1%} (n={count})"
+    lines.append("\n" + "-" * 60)
+    lines.append("PROPOSITIONS ANALYSIS")
+    lines.append("-" * 60)
+    lines.append(
+        f"Average propositions when accurate:   {stats.avg_props_accurate:.2f}"
+    )
+    lines.append(
+        f"Average propositions when inaccurate: {stats.avg_props_inaccurate:.2f}"
+    )
+    lines.append(
+        f"Difference (accurate - inaccurate):   {stats.avg_props_accurate - stats.avg_props_inaccurate:+.2f}"
+    )
+
+    lines.append("\n" + "-" * 60)
+    lines.append("CALIBRATION ANALYSIS")
+    lines.append("-" * 60)
+    # Find bins with worst calibration (only bins that received predictions)
+    midpoints = np.array(CONFIDENCE_BIN_MIDPOINTS)
+    actuals = stats.bin_accuracy
+    counts = stats.bin_totals
+    errors = np.abs(midpoints - actuals)
+
+    nonempty = np.flatnonzero(counts > 0)
+    # Stable sort keeps lower bins first among ties
+    worst = nonempty[np.argsort(-errors[nonempty], kind="stable")[:3]]
+    lines.append("Top 3 worst-calibrated bins:")
+    for i, bin_idx in enumerate(worst.tolist(), 1):
+        lines.append(
+            f"  {i}. Bin {bin_idx * 10}-{(bin_idx + 1) * 10}%: predicted {midpoints[bin_idx]:.1%}, actual {actuals[bin_idx]:.1%}, "
+            f"error {errors[bin_idx]:.1%} (n={counts[bin_idx]})"
         )
 
-    print("\n" + "=" * 60)
+    lines.append("\n" + "=" * 60)
+    print("\n".join(lines))
 
 
 def main() -> None:
     """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--save-individual-html",
+        action="store_true",
+        help="also write each chart as a standalone HTML file next to its PNG",
+    )
+    args = parser.parse_args()
+
     # Paths
     project_root = Path(__file__).parent.parent
     predictions_path = project_root / "lib" / "clue-predictions.json"
     output_dir = project_root / "analysis" / "output"
     output_path = output_dir / "analytics.html"
+    stats_cache_path = output_dir / "stats.pkl"
+    stamp_path = output_dir / ".analytics.stamp"
 
     # Ensure output directory exists
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Load and analyze data
-    print("Loading predictions...")
-    predictions = load_predictions(predictions_path)
-
-    print("Calculating statistics...")
-    stats = calculate_statistics(predictions)
-
-    print("Creating visualization...")
-    create_visualization(stats, output_path)
+    # Skip everything if every output was already built from this exact input
+    stamp = repr(_stats_cache_key(predictions_path))
+    outputs = output_files(output_path, args.save_individual_html)
+    if (
+        stamp_path.exists()
+        and stamp_path.read_text() == stamp
+        and all(path.exists() for path in outputs)
+    ):
+        print(f"{output_path} is up to date with {predictions_path}; nothing to do")
+        return
+    # Outputs are about to be rewritten; the stamp is restored once they all exist
+    stamp_path.unlink(missing_ok=True)
+
+    # Launch Chrome for PNG export in the background now, so its startup
+    # overlaps with loading the data; rendering reuses it through the sync server
+    kaleido.start_sync_server(n=KALEIDO_TABS, silence_warnings=True)
+    try:
+        # Load and analyze data (skipped when the cached statistics are current)
+        stats = load_or_calculate_statistics(predictions_path, stats_cache_path)
+
+        print("Creating visualization...")
+        create_visualization(
+            stats, output_path, save_individual_html=args.save_individual_html
+        )
+    finally:
+        kaleido.stop_sync_server(silence_warnings=True)
+
+    missing = [path.name for path in outputs if not path.exists()]
+    if missing:
+        print(f"⚠️  Missing outputs, will rebuild next run: {', '.join(missing)}")
+        return
+    stamp_path.write_text(stamp)
 
 
 if __name__ == "__main__":
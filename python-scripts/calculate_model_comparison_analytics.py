@@ -1,23 +1,28 @@
 #!/usr/bin/env python3
 """Analyze model comparison data and generate comparison charts."""
 
-import json
-import statistics
+import argparse
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Literal
 
-import plotly.graph_objects as go
+import numpy as np
 from pydantic import BaseModel, TypeAdapter
 
-from generate_serialized_game import SerializedGame
+# Plotly (and Kaleido) are only needed for the charts; they are imported inside
+# the chart functions so load_model_comparison/compute_model_stats stay cheap
+# to import from other scripts.
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 
+# Parsed prediction models are read-only by convention; they are not frozen
+# because they are consumed straight away by compute_model_stats.
 class PredictionMetadata(BaseModel):
     """Metadata for a prediction."""
 
     model: str
 
-    model_config = {"frozen": True}
-
 
 class PredictionData(BaseModel):
     """Prediction result data."""
@@ -27,17 +32,23 @@ class PredictionData(BaseModel):
     confidence: float
     metadata: PredictionMetadata
 
-    model_config = {"frozen": True}
+
+class GameNames(BaseModel):
+    """The only part of a serialized game this script reads.
+
+    Other game fields (propositions, ground truth, ...) are ignored while
+    parsing instead of being validated into a full SerializedGame.
+    """
+
+    names: list[str]
 
 
 class PredictionEntry(BaseModel):
-    """Complete prediction entry with game and prediction data."""
+    """Prediction entry with game suspects and prediction data."""
 
-    game: SerializedGame
+    game: GameNames
     predictionData: PredictionData
 
-    model_config = {"frozen": True}
-
 
 # Human-readable labels for model names
 MODEL_LABELS: dict[str, str] = {
@@ -61,12 +72,24 @@ MODEL_COLORS: dict[str, str] = {
     "ft:gpt-4.1-nano-2025-04-14:personal:all-cases-2:DAo5YWOA": "#16a34a",
 }
 
+# Training-data selections used for the fine-tuned models, as they appear at
+# the start of the suffix in "ft:<base>:<org>:<suffix>:<id>" model names
+FT_STRATEGIES = ("most-conf-wrong", "least-conf-wrong", "correct", "all-cases")
 
-class ModelStats(BaseModel):
+
+# Built internally from already-validated predictions, so a plain dataclass
+# avoids pydantic validation on construction
+@dataclass(slots=True, frozen=True)
+class ModelStats:
     """Aggregated statistics for a single model."""
 
     model: str
     label: str
+    color: str
+    kind: Literal["base", "ft"]
+    # Fine-tuning data selection (one of FT_STRATEGIES) for fine-tuned models
+    ft_strategy: str | None
+    is_nano: bool
     total: int
     correct: int
     accuracy: float
@@ -76,6 +99,20 @@ class ModelStats(BaseModel):
     median_confidence_correct: float
     median_confidence_incorrect: float
     random_chance: float
+    # Display strings shared by the charts and the summary table
+    accuracy_text: str
+    avg_confidence_correct_text: str
+    avg_confidence_incorrect_text: str
+
+
+# Layout settings shared by every comparison chart
+BASE_LAYOUT = {
+    "height": 500,
+    "margin": {"b": 120},
+    "plot_bgcolor": "white",
+    "paper_bgcolor": "white",
+    "xaxis": {"tickangle": -30},
+}
 
 
 def get_label(model: str) -> str:
@@ -86,53 +123,91 @@ def get_color(model: str) -> str:
     return MODEL_COLORS.get(model, "#888888")
 
 
+def get_ft_strategy(model: str) -> str | None:
+    """Return the FT_STRATEGIES entry a fine-tuned model was trained with."""
+    # ft:<base>:<org>:<suffix>:<id>; anything shorter has no strategy suffix
+    parts = model.split(":")
+    if parts[0] != "ft" or len(parts) < 4:
+        return None
+    suffix = parts[3]
+    return next((t for t in FT_STRATEGIES if suffix.startswith(t)), None)
+
+
+# Built once at import; constructing a TypeAdapter compiles its core schema
+MODEL_COMPARISON_ADAPTER = TypeAdapter(dict[str, list[PredictionEntry]])
+
+
 def load_model_comparison(json_path: Path) -> dict[str, list[PredictionEntry]]:
     """Load and validate model comparison predictions from JSON."""
-    with open(json_path) as f:
-        raw_data = json.load(f)
-
-    adapter = TypeAdapter(dict[str, list[PredictionEntry]])
-    return adapter.validate_python(raw_data)
+    # Parse and validate in one pass with pydantic-core's JSON parser
+    return MODEL_COMPARISON_ADAPTER.validate_json(json_path.read_bytes())
 
 
 def compute_model_stats(model: str, predictions: list[PredictionEntry]) -> ModelStats:
     """Compute statistics for a single model."""
-    correct_confs = [
-        p.predictionData.confidence for p in predictions if p.predictionData.correctness
-    ]
-    incorrect_confs = [
-        p.predictionData.confidence
-        for p in predictions
-        if not p.predictionData.correctness
-    ]
-    all_confs = [p.predictionData.confidence for p in predictions]
-    avg_suspects = statistics.mean(len(p.game.names) for p in predictions)
+    # Extract parallel arrays in one pass, then split them with a mask
+    n = len(predictions)
+    confidence = np.empty(n, dtype=np.float64)
+    is_correct = np.empty(n, dtype=np.bool_)
+    num_suspects = np.empty(n, dtype=np.int32)
+    for i, p in enumerate(predictions):
+        confidence[i] = p.predictionData.confidence
+        is_correct[i] = p.predictionData.correctness
+        num_suspects[i] = len(p.game.names)
+
+    correct_confs = confidence[is_correct]
+    incorrect_confs = confidence[~is_correct]
+    avg_suspects = float(num_suspects.mean())
+    accuracy = correct_confs.size / n
+    avg_conf_correct = float(correct_confs.mean()) if correct_confs.size else 0.0
+    avg_conf_incorrect = float(incorrect_confs.mean()) if incorrect_confs.size else 0.0
 
     return ModelStats(
         model=model,
         label=get_label(model),
-        total=len(predictions),
-        correct=len(correct_confs),
-        accuracy=len(correct_confs) / len(predictions),
-        avg_confidence=statistics.mean(all_confs),
-        avg_confidence_correct=statistics.mean(correct_confs) if correct_confs else 0.0,
-        avg_confidence_incorrect=statistics.mean(incorrect_confs)
-        if incorrect_confs
-        else 0.0,
-        median_confidence_correct=statistics.median(correct_confs)
-        if correct_confs
+        color=get_color(model),
+        kind="ft" if model.startswith("ft:") else "base",
+        ft_strategy=get_ft_strategy(model),
+        is_nano="nano" in model,
+        total=n,
+        correct=int(correct_confs.size),
+        accuracy=accuracy,
+        avg_confidence=float(confidence.mean()),
+        avg_confidence_correct=avg_conf_correct,
+        avg_confidence_incorrect=avg_conf_incorrect,
+        median_confidence_correct=float(np.median(correct_confs))
+        if correct_confs.size
         else 0.0,
-        median_confidence_incorrect=statistics.median(incorrect_confs)
-        if incorrect_confs
+        median_confidence_incorrect=float(np.median(incorrect_confs))
+        if incorrect_confs.size
         else 0.0,
         random_chance=1.0 / avg_suspects if avg_suspects > 0 else 0.0,
+        accuracy_text=f"{accuracy:.1%}",
+        avg_confidence_correct_text=f"{avg_conf_correct:.3f}",
+        avg_confidence_incorrect_text=f"{avg_conf_incorrect:.3f}"
+        if incorrect_confs.size
+        else "N/A",
     )
 
 
-def create_accuracy_comparison_chart(
-    all_stats: list[ModelStats], output_dir: Path
-) -> None:
+def add_random_chance_line(fig: "go.Figure", random_chance: float) -> None:
+    """Draw the random-chance accuracy baseline on a percent-scaled chart."""
+    fig.add_hline(
+        y=random_chance * 100,
+        line_dash="dot",
+        line_color="#888",
+        line_width=2,
+        annotation_text=f"Random chance ({random_chance:.1%})",
+        annotation_position="top left",
+        annotation_font_size=12,
+        annotation_font_color="#888",
+    )
+
+
+def create_accuracy_comparison_chart(all_stats: list[ModelStats]) -> "go.Figure":
     """Create bar chart comparing accuracy across models with random chance baseline."""
+    import plotly.graph_objects as go
+
     random_chance = all_stats[0].random_chance
 
     fig = go.Figure()
@@ -141,25 +216,15 @@ def create_accuracy_comparison_chart(
         go.Bar(
             x=[s.label for s in all_stats],
             y=[s.accuracy * 100 for s in all_stats],
-            text=[f"{s.accuracy:.1%}" for s in all_stats],
+            text=[s.accuracy_text for s in all_stats],
             textposition="outside",
             textfont=dict(size=13, color="#222"),
-            marker_color=[get_color(s.model) for s in all_stats],
+            marker_color=[s.color for s in all_stats],
             name="Accuracy",
         )
     )
 
-    # Random chance baseline
-    fig.add_hline(
-        y=random_chance * 100,
-        line_dash="dot",
-        line_color="#888",
-        line_width=2,
-        annotation_text=f"Random chance ({random_chance:.1%})",
-        annotation_position="top left",
-        annotation_font_size=12,
-        annotation_font_color="#888",
-    )
+    add_random_chance_line(fig, random_chance)
 
     fig.update_layout(
         title=dict(
@@ -168,24 +233,18 @@ def create_accuracy_comparison_chart(
         ),
         yaxis_title="Accuracy (%)",
         yaxis=dict(range=[0, 108], ticksuffix="%"),
-        height=500,
         width=900,
         showlegend=False,
-        margin=dict(b=120),
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        xaxis=dict(tickangle=-30),
+        **BASE_LAYOUT,
     )
 
-    fig.write_image(output_dir / "model_accuracy_comparison.png", scale=2)
-    fig.write_html(output_dir / "model_accuracy_comparison.html")
-    print("  Saved accuracy comparison chart")
+    return fig
 
 
-def create_confidence_comparison_chart(
-    all_stats: list[ModelStats], output_dir: Path
-) -> None:
+def create_confidence_comparison_chart(all_stats: list[ModelStats]) -> "go.Figure":
     """Create grouped bar chart comparing avg confidence when correct vs incorrect."""
+    import plotly.graph_objects as go
+
     labels = [s.label for s in all_stats]
 
     fig = go.Figure()
@@ -196,7 +255,7 @@ def create_confidence_comparison_chart(
             y=[s.avg_confidence_correct for s in all_stats],
             name="Avg confidence (correct)",
             marker_color="#16a34a",
-            text=[f"{s.avg_confidence_correct:.3f}" for s in all_stats],
+            text=[s.avg_confidence_correct_text for s in all_stats],
             textposition="outside",
             textfont=dict(size=10),
         )
@@ -208,12 +267,7 @@ def create_confidence_comparison_chart(
             y=[s.avg_confidence_incorrect for s in all_stats],
             name="Avg confidence (incorrect)",
             marker_color="#dc2626",
-            text=[
-                f"{s.avg_confidence_incorrect:.3f}"
-                if s.total - s.correct > 0
-                else "N/A"
-                for s in all_stats
-            ],
+            text=[s.avg_confidence_incorrect_text for s in all_stats],
             textposition="outside",
             textfont=dict(size=10),
         )
@@ -227,7 +281,6 @@ def create_confidence_comparison_chart(
         yaxis_title="Average Confidence",
         yaxis=dict(range=[0, 1.12]),
         barmode="group",
-        height=500,
         width=900,
         legend=dict(
             orientation="h",
@@ -236,26 +289,23 @@ def create_confidence_comparison_chart(
             xanchor="center",
             x=0.5,
         ),
-        margin=dict(b=120),
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        xaxis=dict(tickangle=-30),
+        **BASE_LAYOUT,
     )
 
-    fig.write_image(output_dir / "model_confidence_comparison.png", scale=2)
-    fig.write_html(output_dir / "model_confidence_comparison.html")
-    print("  Saved confidence comparison chart")
+    return fig
 
 
 def create_fine_tuning_strategy_chart(
-    all_stats: list[ModelStats], output_dir: Path
-) -> None:
+    all_stats: list[ModelStats],
+) -> "go.Figure | None":
     """Create a focused chart comparing nano baseline vs fine-tuning strategies."""
+    import plotly.graph_objects as go
+
     # Filter to just nano-based models
-    nano_models = [s for s in all_stats if "nano" in s.model]
+    nano_models = [s for s in all_stats if s.is_nano]
 
     if not nano_models:
-        return
+        return None
 
     random_chance = nano_models[0].random_chance
 
@@ -265,25 +315,15 @@ def create_fine_tuning_strategy_chart(
         go.Bar(
             x=[s.label for s in nano_models],
             y=[s.accuracy * 100 for s in nano_models],
-            text=[f"{s.accuracy:.1%}<br>({s.correct}/{s.total})" for s in nano_models],
+            text=[f"{s.accuracy_text}<br>({s.correct}/{s.total})" for s in nano_models],
             textposition="outside",
             textfont=dict(size=12),
-            marker_color=[get_color(s.model) for s in nano_models],
+            marker_color=[s.color for s in nano_models],
             name="Accuracy",
         )
     )
 
-    # Random chance baseline
-    fig.add_hline(
-        y=random_chance * 100,
-        line_dash="dot",
-        line_color="#888",
-        line_width=2,
-        annotation_text=f"Random chance ({random_chance:.1%})",
-        annotation_position="top left",
-        annotation_font_size=12,
-        annotation_font_color="#888",
-    )
+    add_random_chance_line(fig, random_chance)
 
     fig.update_layout(
         title=dict(
@@ -292,18 +332,39 @@ def create_fine_tuning_strategy_chart(
         ),
         yaxis_title="Accuracy (%)",
         yaxis=dict(range=[0, 115], ticksuffix="%"),
-        height=500,
         width=800,
         showlegend=False,
-        margin=dict(b=120),
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        xaxis=dict(tickangle=-30),
+        **BASE_LAYOUT,
     )
 
-    fig.write_image(output_dir / "fine_tuning_strategy_comparison.png", scale=2)
-    fig.write_html(output_dir / "fine_tuning_strategy_comparison.html")
-    print("  Saved fine-tuning strategy chart")
+    return fig
+
+
+def save_charts(
+    figures: dict[str, "go.Figure"], output_dir: Path, write_png: bool = True
+) -> None:
+    """Save each chart as standalone HTML and, unless disabled, as a 2x PNG.
+
+    The PNGs are rendered in one batch so Kaleido can spread them over the
+    tabs of its sync server (see main).
+    """
+    for name, fig in figures.items():
+        fig.write_html(output_dir / f"{name}.html")
+
+    if write_png:
+        import plotly.io as pio
+
+        # write_images ignores the layout size, so pass each chart's explicitly
+        pio.write_images(
+            list(figures.values()),
+            [output_dir / f"{name}.png" for name in figures],
+            width=[fig.layout.width for fig in figures.values()],
+            height=BASE_LAYOUT["height"],
+            scale=2,
+        )
+
+    for name in figures:
+        print(f"  Saved {name}")
 
 
 def print_summary(all_stats: list[ModelStats]) -> None:
@@ -317,13 +378,10 @@ def print_summary(all_stats: list[ModelStats]) -> None:
     )
     print("-" * 80)
     for s in all_stats:
-        wrong_conf = (
-            f"{s.avg_confidence_incorrect:.3f}" if s.total - s.correct > 0 else "N/A"
-        )
         print(
-            f"{s.label.replace(chr(10), ' '):<45} {s.accuracy:>9.1%} "
+            f"{s.label.replace(chr(10), ' '):<45} {s.accuracy_text:>9} "
             f"{s.correct:>4}/{s.total:<5} "
-            f"{s.avg_confidence_correct:>10.3f} {wrong_conf:>10}"
+            f"{s.avg_confidence_correct_text:>10} {s.avg_confidence_incorrect_text:>10}"
         )
 
     print("-" * 80)
@@ -341,14 +399,16 @@ def print_summary(all_stats: list[ModelStats]) -> None:
     base_mini = stats_by_model.get("gpt-4.1-mini")
     base_nano = stats_by_model.get("gpt-4.1-nano")
 
-    ft_most_conf_wrong = next(
-        (s for s in all_stats if "most-conf-wrong" in s.model), None
-    )
-    ft_least_conf_wrong = next(
-        (s for s in all_stats if "least-conf-wrong" in s.model), None
-    )
-    ft_correct = next((s for s in all_stats if "correct-2" in s.model), None)
-    ft_all = next((s for s in all_stats if "all-cases" in s.model), None)
+    # Index fine-tuned models by strategy; the first one wins if repeated
+    ft_by_strategy: dict[str, ModelStats] = {}
+    for s in all_stats:
+        if s.ft_strategy is not None:
+            ft_by_strategy.setdefault(s.ft_strategy, s)
+
+    ft_most_conf_wrong = ft_by_strategy.get("most-conf-wrong")
+    ft_least_conf_wrong = ft_by_strategy.get("least-conf-wrong")
+    ft_correct = ft_by_strategy.get("correct")
+    ft_all = ft_by_strategy.get("all-cases")
 
     if base_41 and base_mini and base_nano:
         result = base_41.accuracy > base_mini.accuracy > base_nano.accuracy
@@ -361,13 +421,13 @@ def print_summary(all_stats: list[ModelStats]) -> None:
 
     if base_nano:
         all_ft_better = all(
-            s.accuracy > base_nano.accuracy for s in all_stats if "ft:" in s.model
+            s.accuracy > base_nano.accuracy for s in all_stats if s.kind == "ft"
         )
         print(
             f"\n2. Fine-tuning always beats baseline: {'TRUE' if all_ft_better else 'FALSE'}"
         )
         for s in all_stats:
-            if "ft:" in s.model:
+            if s.kind == "ft":
                 delta = s.accuracy - base_nano.accuracy
                 print(
                     f"   {s.label.replace(chr(10), ' ')}: {s.accuracy:.1%} (+{delta:.1%} over nano baseline)"
@@ -416,6 +476,14 @@ def print_summary(all_stats: list[ModelStats]) -> None:
 
 def main() -> None:
     """Main entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--no-png",
+        action="store_true",
+        help="only write the HTML charts; skip the (slow, browser-based) PNG export",
+    )
+    args = parser.parse_args()
+
     project_root = Path(__file__).parent.parent
     json_path = project_root / "lib" / "clue-predictions-model-comparison.json"
     output_dir = project_root / "public"
@@ -440,17 +508,29 @@ def main() -> None:
         "ft:gpt-4.1-nano-2025-04-14:personal:most-conf-wrong-2:DAnlh3at",
         "ft:gpt-4.1-nano-2025-04-14:personal:all-cases-2:DAo5YWOA",
     ]
-    desired_order = base_order + ft_order
-    all_stats.sort(
-        key=lambda s: desired_order.index(s.model)
-        if s.model in desired_order
-        else len(desired_order)
-    )
+    desired_order = {m: i for i, m in enumerate(base_order + ft_order)}
+    all_stats.sort(key=lambda s: desired_order.get(s.model, len(desired_order)))
 
     print("\nGenerating charts...")
-    create_accuracy_comparison_chart(all_stats, output_dir)
-    create_confidence_comparison_chart(all_stats, output_dir)
-    create_fine_tuning_strategy_chart(all_stats, output_dir)
+    figures = {
+        "model_accuracy_comparison": create_accuracy_comparison_chart(all_stats),
+        "model_confidence_comparison": create_confidence_comparison_chart(all_stats),
+        "fine_tuning_strategy_comparison": create_fine_tuning_strategy_chart(all_stats),
+    }
+    figures = {name: fig for name, fig in figures.items() if fig is not None}
+
+    if args.no_png:
+        save_charts(figures, output_dir, write_png=False)
+    else:
+        import kaleido
+
+        # Keep one Chrome alive with a tab per chart so the PNGs render
+        # concurrently instead of launching a browser per chart
+        kaleido.start_sync_server(n=len(figures), silence_warnings=True)
+        try:
+            save_charts(figures, output_dir)
+        finally:
+            kaleido.stop_sync_server(silence_warnings=True)
 
     print_summary(all_stats)
 
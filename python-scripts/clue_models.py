@@ -74,14 +74,36 @@ class ClueGame(BaseModel):
 
     # Sympy symbols for logic
     symbols_map: dict[str, Any] = Field(default_factory=dict)
+    # The same symbols as {name: {attribute value or "is_killer": symbol}}
+    person_symbols: dict[str, dict[str, Any]] = Field(default_factory=dict)
 
     # Ground truth
     ground_truth: dict[str, PersonActivity] = Field(default_factory=dict)
     killer: str = ""
+    # Symbols true in the ground truth (activities and the killer), while that
+    # assignment still satisfies the knowledge base; None if it does not
+    truth_model: set[Any] | None = None
+
+    # SAT variable number of each symbol, and the highest variable in use
+    # (the solver allocates more above the symbols for its own bookkeeping)
+    symbol_vars: dict[Any, int] = Field(default_factory=dict)
+    num_vars: int = 0
+    # SAT variable of each person's "<name>_is_killer" symbol
+    killer_vars: dict[str, int] = Field(default_factory=dict)
 
     # Propositions and knowledge
     propositions: list[tuple[Any, PropositionData]] = Field(default_factory=list)
+    # The full theory as sympy expressions, including the exactly-one-killer
+    # constraints from solver.setup_initial_constraints
     knowledge_base: list[Any] = Field(default_factory=list)
+    # Incremental SAT solver holding knowledge_base as clauses, kept in sync by
+    # solver.add_knowledge (at-most-one-killer is encoded with a sequential
+    # counter rather than from its knowledge-base expression)
+    sat_solver: Any = None
+    # Last check_solution_count result, with the knowledge base size it was
+    # computed for. The knowledge base only ever grows, so anyone not in the
+    # list stays eliminated.
+    possible_killers_cache: tuple[int, list[str]] | None = None
 
     model_config = {"arbitrary_types_allowed": True}
 
@@ -1,34 +1,45 @@
 """Generate clue game test cases and dump to JSON."""
 
-import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from pydantic import TypeAdapter
+
 from generate_serialized_game import generate_test_case, SerializedGame
 
 NUMBER_OF_CASES_TO_GENERATE = 500
 NUMBER_OF_FEW_SHOT_EXAMPLES_TO_GENERATE = 20
 NUMBER_OF_VALIDATION_CASES_TO_GENERATE = 250
 
+# Encodes a whole list of games to JSON in one pass (pydantic-core), with the
+# same bytes as json.dump(..., indent=2) of their model_dump()s
+TEST_CASES_ADAPTER = TypeAdapter(list[SerializedGame])
+
 
 def generate_test_cases(num_cases: int, seed_start: int = 0) -> list[SerializedGame]:
-    """Generate multiple game test cases."""
+    """
+    Generate multiple game test cases.
+
+    Games are independent and each seeds its own RNG, so they are generated in
+    parallel processes; results come back in seed order.
+    """
     test_cases = []
+    seeds = range(seed_start, seed_start + num_cases)
 
     print(f"Generating {num_cases} test cases...")
-    for i in range(num_cases):
-        seed = seed_start + i
-        serialized_game = generate_test_case(seed)
-        test_cases.append(serialized_game)
-        if i % 20 == 0:
-            print(f"Generated {i + 1}/{num_cases} test cases")
+    with ProcessPoolExecutor() as executor:
+        for i, serialized_game in enumerate(
+            executor.map(generate_test_case, seeds, chunksize=8)
+        ):
+            test_cases.append(serialized_game)
+            if i % 20 == 0:
+                print(f"Generated {i + 1}/{num_cases} test cases")
     return test_cases
 
 
 def main() -> None:
     """Generate test cases and dump to JSON."""
-    # Generate test cases
-    seed_start = 1000
-    for n_test_cases, destination_filename in [
+    outputs = [
         (NUMBER_OF_CASES_TO_GENERATE, "clue-test-cases.json"),
         (
             NUMBER_OF_FEW_SHOT_EXAMPLES_TO_GENERATE,
@@ -38,16 +49,22 @@ def main() -> None:
             NUMBER_OF_VALIDATION_CASES_TO_GENERATE,
             "clue-validation-cases.json",
         ),
-    ]:
-        output_path = Path(__file__).parent.parent / "lib" / destination_filename
-        test_cases = generate_test_cases(n_test_cases, seed_start=seed_start)
-        seed_start += n_test_cases
+    ]
+
+    # Generate every file's test cases in one batch (one worker pool), with
+    # consecutive seed ranges per file starting at 1000
+    all_test_cases = generate_test_cases(
+        sum(n_test_cases for n_test_cases, _ in outputs), seed_start=1000
+    )
 
-        test_cases_data = [game.model_dump() for game in test_cases]
+    offset = 0
+    for n_test_cases, destination_filename in outputs:
+        output_path = Path(__file__).parent.parent / "lib" / destination_filename
+        test_cases = all_test_cases[offset : offset + n_test_cases]
+        offset += n_test_cases
 
         # Write to file with indentation
-        with output_path.open("w") as f:
-            json.dump(test_cases_data, f, indent=2)
+        output_path.write_bytes(TEST_CASES_ADAPTER.dump_json(test_cases, indent=2))
 
         print(f"\n✅ Wrote {len(test_cases)} test cases to {output_path}")
         print(
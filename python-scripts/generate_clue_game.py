@@ -1,9 +1,10 @@
 """Module for generating Clue logic games with propositions."""
 
 import random
+from itertools import accumulate
 from typing import Any
 
-from sympy import And, Implies, Not, Or
+from sympy import And, Not, Or
 
 from clue_models import (
     ClueGame,
@@ -13,13 +14,36 @@ from clue_models import (
     PropositionType,
 )
 from solver import (
+    add_knowledge,
     check_solution_count,
+    create_sat_solver,
     create_symbols,
+    ground_truth_symbols,
+    is_entailed,
     is_feasible_with_proposition,
+    only_true_killer_possible,
     setup_initial_constraints,
+    symbol_vars,
+    symbols_by_person,
 )
 from ui import render_proposition
 
+# Attribute categories propositions draw on (simple statements may also use place)
+ATTRIBUTE_CATEGORIES = ("material", "institution", "food")
+ATTRIBUTE_CATEGORIES_WITH_PLACE = (*ATTRIBUTE_CATEGORIES, "place")
+
+# Proposition types and their weights, favouring more definitive statements to
+# help convergence. random.choices is given the cumulative weights so it does
+# not re-accumulate them on every call (the draw itself is identical).
+PROPOSITION_TYPES = (
+    PropositionType.PERSON_AND_ATTRIBUTE,
+    PropositionType.PERSON_OR_PERSON,
+    PropositionType.PERSON_ATTRIBUTE_IMPLIES_NOT_KILLER,
+    PropositionType.COMPLEX_OR,
+    PropositionType.DIRECT_ELIMINATION,
+)
+PROPOSITION_CUM_WEIGHTS = tuple(accumulate((40, 20, 20, 15, 5)))
+
 
 def create_game(config: GameConfig, seed: int | None = None) -> ClueGame:
     """Initialize a new game from configuration."""
@@ -27,15 +51,15 @@ def create_game(config: GameConfig, seed: int | None = None) -> ClueGame:
         random.seed(seed)
 
     symbols_map = create_symbols(
-        config.names,
-        config.materials,
-        config.institutions,
-        config.foods,
-        config.places,
-        config.companies,
-        config.technologies,
+        tuple(config.names),
+        tuple(config.materials),
+        tuple(config.institutions),
+        tuple(config.foods),
+        tuple(config.places),
     )
 
+    variables = symbol_vars(symbols_map)
+
     return ClueGame(
         names=list(config.names),
         technologies=list(config.technologies),
@@ -45,6 +69,13 @@ def create_game(config: GameConfig, seed: int | None = None) -> ClueGame:
         foods=list(config.foods),
         materials=list(config.materials),
         symbols_map=symbols_map,
+        person_symbols=symbols_by_person(symbols_map),
+        symbol_vars=variables,
+        num_vars=len(symbols_map),
+        killer_vars={
+            name: variables[symbols_map[f"{name}_is_killer"]] for name in config.names
+        },
+        sat_solver=create_sat_solver(),
     )
 
 
@@ -63,11 +94,23 @@ def setup_scenario(game: ClueGame) -> None:
 
     # Pick the killer
     game.killer = random.choice(game.names)
+    game.truth_model = ground_truth_symbols(game)
 
     # Set up initial constraints
     setup_initial_constraints(game)
 
 
+def choose_other(names: list[str], i: int) -> str:
+    """
+    Pick a random name other than names[i] without building a filtered list.
+
+    Draws the same random number as random.choice on the filtered list would,
+    and maps it to the same name, so seeded games are unchanged.
+    """
+    k = random.randrange(len(names) - 1)
+    return names[k + (k >= i)]
+
+
 def generate_proposition(game: ClueGame) -> tuple[Any, PropositionData] | None:
     """
     Generate a random proposition that's consistent with ground truth.
@@ -80,30 +123,21 @@ def generate_proposition(game: ClueGame) -> tuple[Any, PropositionData] | None:
     These propositions provide alibis: if we know what someone was doing,
     they might not be the killer (or they become a suspect).
     """
-    # Weight towards more definitive statements to help convergence
-    prop_type = random.choices(
-        [
-            PropositionType.PERSON_AND_ATTRIBUTE,
-            PropositionType.PERSON_OR_PERSON,
-            PropositionType.PERSON_ATTRIBUTE_IMPLIES_NOT_KILLER,
-            PropositionType.COMPLEX_OR,
-            PropositionType.DIRECT_ELIMINATION,
-        ],
-        weights=[40, 20, 20, 15, 5],
-    )[0]
+    prop_type = random.choices(PROPOSITION_TYPES, cum_weights=PROPOSITION_CUM_WEIGHTS)[
+        0
+    ]
 
     if prop_type == PropositionType.PERSON_AND_ATTRIBUTE:
         # Simple: "Joe was with cement" or "Joe was at the library"
         person = random.choice(game.names)
-        attr_category = random.choice(["material", "institution", "food", "place"])
+        attr_category = random.choice(ATTRIBUTE_CATEGORIES_WITH_PLACE)
         actual_value = getattr(game.ground_truth[person], attr_category)
 
         # Create the sympy expression
-        symbol_key = f"{person}_{actual_value}"
-        if symbol_key not in game.symbols_map:
+        proposition = game.person_symbols[person].get(actual_value)
+        if proposition is None:
             return None
 
-        proposition = game.symbols_map[symbol_key]
         prop_data = PropositionData(
             prop_type=PropositionType.PERSON_AND_ATTRIBUTE,
             person=person,
@@ -115,17 +149,18 @@ def generate_proposition(game: ClueGame) -> tuple[Any, PropositionData] | None:
 
     elif prop_type == PropositionType.PERSON_OR_PERSON:
         # "Either Joe was at library OR John was with cement"
-        person1 = random.choice(game.names)
-        person2 = random.choice([n for n in game.names if n != person1])
+        i = random.randrange(len(game.names))
+        person1 = game.names[i]
+        person2 = choose_other(game.names, i)
 
-        attr1_cat = random.choice(["material", "institution", "food"])
-        attr2_cat = random.choice(["material", "institution", "food"])
+        attr1_cat = random.choice(ATTRIBUTE_CATEGORIES)
+        attr2_cat = random.choice(ATTRIBUTE_CATEGORIES)
 
         val1 = getattr(game.ground_truth[person1], attr1_cat)
         val2 = getattr(game.ground_truth[person2], attr2_cat)
 
-        sym1 = game.symbols_map.get(f"{person1}_{val1}")
-        sym2 = game.symbols_map.get(f"{person2}_{val2}")
+        sym1 = game.person_symbols[person1].get(val1)
+        sym2 = game.person_symbols[person2].get(val2)
 
         if sym1 is None or sym2 is None:
             return None
@@ -146,22 +181,22 @@ def generate_proposition(game: ClueGame) -> tuple[Any, PropositionData] | None:
     elif prop_type == PropositionType.PERSON_ATTRIBUTE_IMPLIES_NOT_KILLER:
         # "If Joe was at church, Joe is not the killer" (alibi)
         # Pick a non-killer to give an alibi to
-        innocent_people = [n for n in game.names if n != game.killer]
-        if not innocent_people:
+        if len(game.names) < 2:
             return None
 
-        person = random.choice(innocent_people)
-        attr_cat = random.choice(["material", "institution", "food"])
+        person = choose_other(game.names, game.names.index(game.killer))
+        attr_cat = random.choice(ATTRIBUTE_CATEGORIES)
         val = getattr(game.ground_truth[person], attr_cat)
 
-        person_attr_sym = game.symbols_map.get(f"{person}_{val}")
-        killer_sym = game.symbols_map[f"{person}_is_killer"]
+        person_attr_sym = game.person_symbols[person].get(val)
+        killer_sym = game.person_symbols[person]["is_killer"]
 
         if person_attr_sym is None:
             return None
 
-        # If person was with attribute, they're not the killer
-        proposition = Implies(person_attr_sym, Not(killer_sym))
+        # If person was with attribute, they're not the killer, written
+        # directly as the clause (~attribute | ~killer)
+        proposition = Or(Not(person_attr_sym), Not(killer_sym))
         prop_data = PropositionData(
             prop_type=PropositionType.PERSON_ATTRIBUTE_IMPLIES_NOT_KILLER,
             person=person,
@@ -173,16 +208,17 @@ def generate_proposition(game: ClueGame) -> tuple[Any, PropositionData] | None:
 
     elif prop_type == PropositionType.COMPLEX_OR:
         # Complex: "(Will and cement) OR (Joe and beer and library)"
-        person1 = random.choice(game.names)
-        person2 = random.choice([n for n in game.names if n != person1])
+        i = random.randrange(len(game.names))
+        person1 = game.names[i]
+        person2 = choose_other(game.names, i)
 
         mat1 = game.ground_truth[person1].material
         food2 = game.ground_truth[person2].food
         inst2 = game.ground_truth[person2].institution
 
-        sym1 = game.symbols_map.get(f"{person1}_{mat1}")
-        sym2_food = game.symbols_map.get(f"{person2}_{food2}")
-        sym2_inst = game.symbols_map.get(f"{person2}_{inst2}")
+        sym1 = game.person_symbols[person1].get(mat1)
+        sym2_food = game.person_symbols[person2].get(food2)
+        sym2_inst = game.person_symbols[person2].get(inst2)
 
         if sym1 is None or sym2_food is None or sym2_inst is None:
             return None
@@ -213,17 +249,18 @@ def generate_proposition(game: ClueGame) -> tuple[Any, PropositionData] | None:
         person = random.choice(innocent_suspects)
 
         # Give them an alibi by stating they were somewhere
-        attr_cat = random.choice(["material", "institution", "food"])
+        attr_cat = random.choice(ATTRIBUTE_CATEGORIES)
         val = getattr(game.ground_truth[person], attr_cat)
 
-        person_attr_sym = game.symbols_map.get(f"{person}_{val}")
-        killer_sym = game.symbols_map[f"{person}_is_killer"]
+        person_attr_sym = game.person_symbols[person].get(val)
+        killer_sym = game.person_symbols[person]["is_killer"]
 
         if person_attr_sym is None:
             return None
 
-        # Both: person was there AND if they were there, they're not the killer
-        proposition = And(person_attr_sym, Implies(person_attr_sym, Not(killer_sym)))
+        # Both: person was there AND if they were there, they're not the killer,
+        # which simplifies to: person was there AND is not the killer
+        proposition = And(person_attr_sym, Not(killer_sym))
         prop_data = PropositionData(
             prop_type=PropositionType.DIRECT_ELIMINATION,
             person=person,
@@ -237,7 +274,10 @@ def generate_proposition(game: ClueGame) -> tuple[Any, PropositionData] | None:
 
 
 def generate_game_until_unique_solution(
-    game: ClueGame, verbose: bool = True, max_attempts: int = 1000
+    game: ClueGame,
+    verbose: bool = True,
+    max_attempts: int = 1000,
+    skip_redundant: bool = False,
 ) -> str:
     """
     Generate propositions until exactly one killer remains.
@@ -245,7 +285,8 @@ def generate_game_until_unique_solution(
     Process:
     1. Generate a candidate proposition
     2. Check if adding it would make the problem infeasible
-    3. If infeasible, reject it and try another
+    3. If infeasible (or, with skip_redundant, already implied), reject it
+       and try another
     4. If feasible, add it and check for unique solution
     5. If unique solution found, stop
     6. Otherwise, continue until convergence
@@ -254,6 +295,9 @@ def generate_game_until_unique_solution(
         game: The game to generate propositions for
         verbose: Whether to print progress
         max_attempts: Safety limit to prevent infinite loops
+        skip_redundant: Reject propositions the knowledge base already implies.
+            Games get shorter but differ from the default output for a seed,
+            so this is off by default to keep existing datasets reproducible.
 
     Returns the identified killer's name.
     """
@@ -277,8 +321,13 @@ def generate_game_until_unique_solution(
                 print(f"❌ Rejected (infeasible): {render_proposition(prop_data)}")
             continue
 
+        if skip_redundant and is_entailed(game, proposition_expr):
+            if verbose:
+                print(f"⏭️  Skipped (already known): {render_proposition(prop_data)}")
+            continue
+
         # Add to knowledge base (it's feasible)
-        game.knowledge_base.append(proposition_expr)
+        add_knowledge(game, proposition_expr)
         game.propositions.append(prop)
         propositions_generated += 1
 
@@ -287,6 +336,11 @@ def generate_game_until_unique_solution(
                 f"📜 Proposition {propositions_generated}: {render_proposition(prop_data)}"
             )
 
+        # Without progress output there is nothing to report per step, so one
+        # solve can tell whether anyone besides the true killer is left
+        if not verbose and not only_true_killer_possible(game):
+            continue
+
         # Check if we've narrowed it down to a unique solution
         try:
             count, possible = check_solution_count(game)
@@ -62,8 +62,10 @@ class SerializedGame(BaseModel):
 
 def serialize_proposition_data(prop_data: PropositionData) -> SerializedProposition:
     """Convert PropositionData to SerializedProposition."""
-    return SerializedProposition(
-        prop_type=prop_data.prop_type,
+    # model_construct skips validation: every field comes from the generated
+    # game, not from outside input
+    return SerializedProposition.model_construct(
+        prop_type=prop_data.prop_type.value,
         person=prop_data.person,
         person1=prop_data.person1,
         person2=prop_data.person2,
@@ -83,7 +85,9 @@ def generate_test_case(seed: int = 0) -> SerializedGame:
     game = create_game(DEFAULT_CONFIG, seed=seed)
     setup_scenario(game)
     generate_game_until_unique_solution(game, verbose=False)
-    serialized_game = SerializedGame(
+    # Built with model_construct like serialize_proposition_data; the game's
+    # fields already have the declared types
+    serialized_game = SerializedGame.model_construct(
         seed=seed,
         killer=game.killer,
         names=game.names,
@@ -94,7 +98,7 @@ def generate_test_case(seed: int = 0) -> SerializedGame:
         foods=game.foods,
         materials=game.materials,
         ground_truth={
-            name: SerializedPersonActivity(
+            name: SerializedPersonActivity.model_construct(
                 technology=activity.technology,
                 place=activity.place,
                 company=activity.company,
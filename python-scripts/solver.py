@@ -1,23 +1,42 @@
-"""Solver module for Clue logic game using sympy."""
+"""Solver module for Clue logic game using sympy.
 
+Propositions are built as sympy expressions, but satisfiability is checked
+incrementally with PySAT's Glucose3: each expression is converted to CNF
+clauses over integer variables once, when it is added, and the candidate
+killer or proposition under test is passed as solver assumptions.
+"""
+
+from functools import lru_cache
+from itertools import combinations
 from typing import Any
 
-from sympy import And, Not, Or, symbols
-from sympy.logic.inference import satisfiable
+from pysat.solvers import Glucose3
+from sympy import And, Implies, Not, Or, Symbol, symbols
 
 from clue_models import ClueGame
 
+# A CNF clause in DIMACS form: positive/negative variable numbers for plain and
+# negated literals, e.g. (a | ~b) is (var_a, -var_b)
+Clause = tuple[int, ...]
+
 
+@lru_cache(maxsize=4)
 def create_symbols(
-    names: list[str],
-    materials: list[str],
-    institutions: list[str],
-    foods: list[str],
-    places: list[str],
-    companies: list[str],
-    technologies: list[str],
+    names: tuple[str, ...],
+    materials: tuple[str, ...],
+    institutions: tuple[str, ...],
+    foods: tuple[str, ...],
+    places: tuple[str, ...],
 ) -> dict[str, Any]:
-    """Create sympy symbols for each person-attribute combination."""
+    """
+    Create sympy symbols for each person-attribute combination.
+
+    Only the categories that propositions can mention get symbols; companies
+    and technologies are part of the ground truth but never used in logic.
+
+    Cached, since every game with the same config needs the same symbols: the
+    returned dict is shared between calls and must not be modified.
+    """
     symbols_map: dict[str, Any] = {}
 
     for name in names:
@@ -33,12 +52,6 @@ def create_symbols(
         for place in places:
             key = f"{name}_{place}"
             symbols_map[key] = symbols(key)
-        for company in companies:
-            key = f"{name}_{company}"
-            symbols_map[key] = symbols(key)
-        for tech in technologies:
-            key = f"{name}_{tech}"
-            symbols_map[key] = symbols(key)
 
     # Also create symbols for "is_killer"
     for name in names:
@@ -48,35 +61,209 @@ def create_symbols(
     return symbols_map
 
 
+def symbols_by_person(symbols_map: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Regroup "<name>_<value>" symbols as {name: {value: symbol}}."""
+    grouped: dict[str, dict[str, Any]] = {}
+    for key, sym in symbols_map.items():
+        name, _, value = key.partition("_")
+        grouped.setdefault(name, {})[value] = sym
+    return grouped
+
+
+def symbol_vars(symbols_map: dict[str, Any]) -> dict[Any, int]:
+    """Number each symbol as a SAT variable (1-based, as DIMACS requires)."""
+    return {sym: i for i, sym in enumerate(symbols_map.values(), start=1)}
+
+
+def create_sat_solver() -> Glucose3:
+    """Create the incremental SAT solver that holds a game's knowledge base."""
+    return Glucose3()
+
+
+def expr_to_clauses(
+    expr: Any, variables: dict[Any, int], negate: bool = False
+) -> list[Clause]:
+    """
+    Convert a sympy boolean expression (Symbol/Not/And/Or/Implies) to CNF clauses.
+
+    Negation is pushed down to the symbols and disjunctions are distributed
+    over conjunctions, so the result is equivalent to the expression (or to
+    its negation when negate is True).
+    """
+    if isinstance(expr, Symbol):
+        var = variables[expr]
+        return [(-var,)] if negate else [(var,)]
+
+    if isinstance(expr, Not):
+        return expr_to_clauses(expr.args[0], variables, not negate)
+
+    if isinstance(expr, Implies):
+        # a -> b is ~a | b; its negation is a & ~b
+        a, b = expr.args
+        if negate:
+            return expr_to_clauses(a, variables) + expr_to_clauses(b, variables, True)
+        parts = [expr_to_clauses(a, variables, True), expr_to_clauses(b, variables)]
+        is_conjunction = False
+    elif isinstance(expr, (And, Or)):
+        parts = [expr_to_clauses(arg, variables, negate) for arg in expr.args]
+        # De Morgan: a negated And is a disjunction and vice versa
+        is_conjunction = isinstance(expr, And) != negate
+    else:
+        raise TypeError(f"Unsupported expression in proposition: {expr!r}")
+
+    if is_conjunction:
+        return [clause for part in parts for clause in part]
+
+    # Distribute the disjunction: pick one clause from each part and merge them
+    clauses: list[Clause] = [()]
+    for part in parts:
+        clauses = [clause + part_clause for clause in clauses for part_clause in part]
+    # Drop tautologies (a symbol appearing both plain and negated) and repeats
+    return [
+        tuple(dict.fromkeys(clause))
+        for clause in clauses
+        if not any(-lit in clause for lit in clause)
+    ]
+
+
+def ground_truth_symbols(game: ClueGame) -> set[Any]:
+    """Collect the symbols that are true in the ground truth, incl. the killer."""
+    true_symbols = {game.person_symbols[game.killer]["is_killer"]}
+    for name, activity in game.ground_truth.items():
+        person_symbols = game.person_symbols[name]
+        # Companies and technologies have no symbols (see create_symbols)
+        true_symbols.update(
+            person_symbols[value]
+            for value in (
+                activity.material,
+                activity.institution,
+                activity.food,
+                activity.place,
+            )
+        )
+    return true_symbols
+
+
+def evaluate(expr: Any, true_symbols: set[Any]) -> bool:
+    """Evaluate a sympy boolean expression with exactly true_symbols set true."""
+    if isinstance(expr, Symbol):
+        return expr in true_symbols
+    if isinstance(expr, Not):
+        return not evaluate(expr.args[0], true_symbols)
+    if isinstance(expr, And):
+        return all(evaluate(arg, true_symbols) for arg in expr.args)
+    if isinstance(expr, Or):
+        return any(evaluate(arg, true_symbols) for arg in expr.args)
+    if isinstance(expr, Implies):
+        a, b = expr.args
+        return not evaluate(a, true_symbols) or evaluate(b, true_symbols)
+    raise TypeError(f"Unsupported expression in proposition: {expr!r}")
+
+
+def at_most_one_clauses(variables: list[int], first_aux: int) -> list[Clause]:
+    """
+    Encode "at most one of variables is true" with a sequential counter.
+
+    Uses len(variables) - 1 auxiliary variables numbered from first_aux, where
+    aux i means "one of the first i + 1 variables is true", giving 3n - 4
+    clauses instead of the n(n - 1) / 2 of the pairwise encoding.
+    """
+    if len(variables) < 2:
+        return []
+    aux = [first_aux + i for i in range(len(variables) - 1)]
+    clauses: list[Clause] = [(-variables[0], aux[0])]
+    for i in range(1, len(variables) - 1):
+        clauses += [
+            (-variables[i], aux[i]),  # x_i -> s_i
+            (-aux[i - 1], aux[i]),  # s_{i-1} -> s_i
+            (-variables[i], -aux[i - 1]),  # not both x_i and an earlier x
+        ]
+    clauses.append((-variables[-1], -aux[-1]))
+    return clauses
+
+
+@lru_cache(maxsize=4)
+def at_most_one_expr(syms: tuple[Any, ...]) -> Any:
+    """
+    Pairwise sympy form of "at most one of syms is true".
+
+    Only recorded in the knowledge base; the solver gets at_most_one_clauses.
+    Cached because games with the same config share their symbols.
+    """
+    return And(*(Or(Not(x), Not(y)) for x, y in combinations(syms, 2)))
+
+
+def add_knowledge(game: ClueGame, expr: Any) -> None:
+    """Add an expression to the knowledge base and its clauses to the solver."""
+    game.knowledge_base.append(expr)
+    game.sat_solver.append_formula(expr_to_clauses(expr, game.symbol_vars))
+    if game.truth_model is not None and not evaluate(expr, game.truth_model):
+        game.truth_model = None
+
+
 def check_solution_count(game: ClueGame) -> tuple[int, list[str]]:
     """
     Count how many possible killers remain given current knowledge.
 
-    Uses sympy's satisfiable() to check each person.
+    Checks for each person whether the knowledge base is satisfiable with
+    that person as the killer. Only people still possible after the previous
+    check are re-tested, since adding knowledge can never bring anyone back.
     """
     if not game.knowledge_base:
         return len(game.names), game.names
 
-    # Combine all knowledge
-    combined_knowledge = And(*game.knowledge_base)
+    # Reuse the last result while the knowledge base is unchanged; e.g. a
+    # DIRECT_ELIMINATION candidate asks again right after the main loop did
+    kb_size = len(game.knowledge_base)
+    if game.possible_killers_cache and game.possible_killers_cache[0] == kb_size:
+        possible_killers = game.possible_killers_cache[1]
+        return len(possible_killers), possible_killers
 
+    candidates = (
+        game.possible_killers_cache[1] if game.possible_killers_cache else game.names
+    )
     possible_killers = []
 
     # For each person, check if "person is killer" is satisfiable
-    for name in game.names:
-        killer_sym = game.symbols_map[f"{name}_is_killer"]
+    for name in candidates:
+        if name == game.killer and game.truth_model is not None:
+            # The ground truth satisfies the knowledge base with this person as
+            # the killer, so it is a witness; no need to ask the solver
+            possible_killers.append(name)
+            continue
         # Check if this person being the killer is consistent with our knowledge
-        test_expr = And(combined_knowledge, killer_sym)
-
-        solution = satisfiable(test_expr)
-
-        if solution is not False:
+        if game.sat_solver.solve(assumptions=[game.killer_vars[name]]):
             # This person could be the killer
             possible_killers.append(name)
 
+    game.possible_killers_cache = (kb_size, possible_killers)
     return len(possible_killers), possible_killers
 
 
+def only_true_killer_possible(game: ClueGame) -> bool:
+    """
+    Check whether the true killer is the only possible killer left.
+
+    Asks the solver once whether anyone else could be the killer, instead of
+    once per candidate as check_solution_count does. Relies on the feasibility
+    check having kept the true killer possible.
+    """
+    candidates = (
+        game.possible_killers_cache[1] if game.possible_killers_cache else game.names
+    )
+    others = [game.killer_vars[name] for name in candidates if name != game.killer]
+    if not others:
+        return True
+
+    # "One of the others is the killer", guarded by a fresh selector variable
+    game.num_vars += 1
+    selector = game.num_vars
+    game.sat_solver.add_clause([*others, -selector])
+    someone_else = game.sat_solver.solve(assumptions=[selector])
+    game.sat_solver.add_clause([-selector])
+    return not someone_else
+
+
 def is_feasible_with_proposition(game: ClueGame, proposition_expr: Any) -> bool:
     """
     Check if adding this proposition would keep the problem feasible.
@@ -87,19 +274,50 @@ def is_feasible_with_proposition(game: ClueGame, proposition_expr: Any) -> bool:
 
     Returns True if the true killer can still be the killer after adding this proposition.
     """
-    # Test the knowledge base with this new proposition
-    test_kb = game.knowledge_base + [proposition_expr]
-    combined = And(*test_kb)
+    # Fast path: if the ground truth (in which the true killer is the killer)
+    # satisfies the knowledge base and this proposition, it is itself a
+    # witness, so no SAT call is needed. Generated propositions always hold
+    # in the ground truth, so this is the common case.
+    if game.truth_model is not None and evaluate(proposition_expr, game.truth_model):
+        return True
+
+    # Test the knowledge base with this new proposition. Its clauses are added
+    # guarded by a fresh selector variable (clause | ~selector), so they only
+    # apply while the selector is assumed true.
+    game.num_vars += 1
+    selector = game.num_vars
+    for clause in expr_to_clauses(proposition_expr, game.symbol_vars):
+        game.sat_solver.add_clause([*clause, -selector])
 
     # CRITICAL: Check if the TRUE killer is still possible after adding this proposition
     # This guarantees we never eliminate the correct answer
-    true_killer_sym = game.symbols_map[f"{game.killer}_is_killer"]
-    test_expr = And(combined, true_killer_sym)
+    true_killer_var = game.killer_vars[game.killer]
+    feasible = game.sat_solver.solve(assumptions=[selector, true_killer_var])
 
-    solution = satisfiable(test_expr)
+    # Retract the test clauses for good; an accepted proposition is added again
+    # unguarded by add_knowledge
+    game.sat_solver.add_clause([-selector])
 
     # Return True only if the TRUE killer remains a valid possibility
-    return solution is not False
+    return feasible
+
+
+def is_entailed(game: ClueGame, proposition_expr: Any) -> bool:
+    """
+    Check if the knowledge base already implies this proposition.
+
+    True when the knowledge base plus the proposition's negation is
+    unsatisfiable, i.e. adding the proposition would tell the solver nothing.
+    """
+    # Same selector trick as is_feasible_with_proposition, on the negation
+    game.num_vars += 1
+    selector = game.num_vars
+    for clause in expr_to_clauses(proposition_expr, game.symbol_vars, negate=True):
+        game.sat_solver.add_clause([*clause, -selector])
+
+    entailed = not game.sat_solver.solve(assumptions=[selector])
+    game.sat_solver.add_clause([-selector])
+    return entailed
 
 
 def setup_initial_constraints(game: ClueGame) -> None:
@@ -108,15 +326,13 @@ def setup_initial_constraints(game: ClueGame) -> None:
 
     # At least one killer
     at_least_one = Or(*killer_symbols)
-    game.knowledge_base.append(at_least_one)
-
-    # At most one killer (if X is killer, others are not)
-    for i, name1 in enumerate(game.names):
-        for name2 in game.names[i + 1 :]:
-            not_both = Not(
-                And(
-                    game.symbols_map[f"{name1}_is_killer"],
-                    game.symbols_map[f"{name2}_is_killer"],
-                )
-            )
-            game.knowledge_base.append(not_both)
+    add_knowledge(game, at_least_one)
+
+    # At most one killer (if X is killer, others are not). The knowledge base
+    # records the pairwise form; the solver gets a sequential counter directly,
+    # since that encoding needs auxiliary variables that have no sympy symbol.
+    game.knowledge_base.append(at_most_one_expr(tuple(killer_symbols)))
+    killer_vars = [game.killer_vars[name] for name in game.names]
+    first_aux = game.num_vars + 1
+    game.num_vars += max(len(killer_vars) - 1, 0)
+    game.sat_solver.append_formula(at_most_one_clauses(killer_vars, first_aux))
@@ -0,0 +1,140 @@
+"""Tests for calculate_analytics (statistics cache, outputs, chart traces)."""
+
+import json
+import pickle
+
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+import calculate_analytics
+from calculate_analytics import (
+    CHART_BUILDERS,
+    SCATTER_MAX_POINTS,
+    load_or_calculate_statistics,
+    output_files,
+    props_confidence_trace,
+)
+
+
+@pytest.fixture
+def predictions_path(tmp_path):
+    """A small predictions file with one correct and one wrong prediction."""
+    entries = [
+        {
+            "game": {"names": ["Joe", "John", "Bob"], "propositions": [{}] * n_props},
+            "predictionData": {
+                "prediction": "Joe",
+                "correctness": correct,
+                "confidence": confidence,
+                "metadata": {"model": "gpt-4.1"},
+            },
+        }
+        for n_props, correct, confidence in [(5, True, 0.9), (8, False, 0.4)]
+    ]
+    path = tmp_path / "clue-predictions.json"
+    path.write_text(json.dumps(entries))
+    return path
+
+
+def test_cache_is_reused(predictions_path, tmp_path, capsys):
+    """A second load reads the statistics back from the cache."""
+    cache_path = tmp_path / "stats.pkl"
+    stats = load_or_calculate_statistics(predictions_path, cache_path)
+    out = capsys.readouterr().out
+    # A missing cache is the normal first run, not worth a warning
+    assert "Calculating statistics" in out
+    assert "Stats cache unusable" not in out
+
+    cached = load_or_calculate_statistics(predictions_path, cache_path)
+    assert "Using cached statistics" in capsys.readouterr().out
+    assert cached.total_predictions == stats.total_predictions == 2
+    assert cached.total_accurate == 1
+
+
+@pytest.mark.parametrize(
+    ("stale_cache", "unusable"),
+    [
+        # Pickled by an older version: references a class that no longer exists
+        (b"ccalculate_analytics\nConfidenceBin\n.", True),
+        # The old single-record (key, stats) layout: just a key mismatch
+        (pickle.dumps(((0, 0, 0), None)), False),
+        # Truncated / not a pickle at all
+        (b"\x80\x05\x95", True),
+        (b"not a pickle", True),
+    ],
+)
+def test_stale_cache_is_recomputed(
+    predictions_path, tmp_path, capsys, stale_cache, unusable
+):
+    """An unreadable or outdated cache falls back to recomputing and is replaced."""
+    cache_path = tmp_path / "stats.pkl"
+    cache_path.write_bytes(stale_cache)
+
+    stats = load_or_calculate_statistics(predictions_path, cache_path)
+    out = capsys.readouterr().out
+    assert "Calculating statistics" in out
+    assert ("Stats cache unusable" in out) == unusable
+    assert stats.total_predictions == 2
+
+    load_or_calculate_statistics(predictions_path, cache_path)
+    assert "Using cached statistics" in capsys.readouterr().out
+
+
+def test_failed_cache_write_leaves_no_temp_file(
+    predictions_path, tmp_path, monkeypatch
+):
+    """If pickling fails, the error propagates and no *.tmp file is left behind."""
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+    # A lambda can't be pickled
+    monkeypatch.setattr(
+        calculate_analytics, "calculate_statistics", lambda predictions: lambda: None
+    )
+
+    with pytest.raises((pickle.PicklingError, AttributeError)):
+        load_or_calculate_statistics(predictions_path, output_dir / "stats.pkl")
+    assert list(output_dir.iterdir()) == []
+
+
+@pytest.mark.parametrize("save_individual_html", [False, True])
+def test_output_files(tmp_path, save_individual_html):
+    """output_files lists the page, every PNG, and the chart HTML when requested."""
+    output_path = tmp_path / "analytics.html"
+    files = output_files(output_path, save_individual_html)
+
+    assert files[0] == output_path
+    names = {path.name for path in files[1:]}
+    assert {f"{name}.png" for name in CHART_BUILDERS} <= names
+    assert any(name.endswith(".html") for name in names) == save_individual_html
+    assert len(files) == 1 + len(CHART_BUILDERS) * (2 if save_individual_html else 1)
+
+
+def test_props_confidence_trace_bins_many_points():
+    """Above SCATTER_MAX_POINTS the panel becomes a labelled density heatmap."""
+    rng = np.random.default_rng(0)
+    n = SCATTER_MAX_POINTS + 1
+    props = rng.integers(5, 80, size=n)
+    confs = rng.random(n)
+
+    trace = props_confidence_trace(
+        props, confs, color="green", size=5, opacity=0.6, name="Accurate"
+    )
+
+    assert isinstance(trace, go.Heatmap)
+    assert np.asarray(trace.z).sum() == n
+    assert "Accurate" in trace.colorbar.title.text
+
+
+def test_props_confidence_trace_scatters_few_points():
+    """Below SCATTER_MAX_POINTS every prediction is its own named marker."""
+    trace = props_confidence_trace(
+        np.array([5, 8]),
+        np.array([0.9, 0.4]),
+        color="red",
+        size=5,
+        opacity=0.6,
+        name="Inaccurate",
+    )
+    assert isinstance(trace, go.Scattergl)
+    assert trace.name == "Inaccurate"
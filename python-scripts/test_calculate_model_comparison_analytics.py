@@ -0,0 +1,22 @@
+"""Tests for model-name parsing in calculate_model_comparison_analytics."""
+
+import pytest
+
+from calculate_model_comparison_analytics import get_ft_strategy
+
+
+@pytest.mark.parametrize(
+    ("model", "expected"),
+    [
+        ("ft:gpt-4.1-nano-2025-04-14:org:most-conf-wrong-1:abc123", "most-conf-wrong"),
+        ("ft:gpt-4.1-2025-04-14:org:all-cases:abc123", "all-cases"),
+        ("ft:gpt-4.1-2025-04-14:org:other:abc123", None),
+        ("gpt-4.1", None),
+        # Truncated or org-less ids have no strategy suffix
+        ("ft:gpt-4.1", None),
+        ("ft:gpt-4.1:most-conf-wrong", None),
+        ("ft:", None),
+    ],
+)
+def test_get_ft_strategy(model, expected):
+    assert get_ft_strategy(model) == expected
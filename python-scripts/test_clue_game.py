@@ -1,12 +1,15 @@
 """Integration tests for Clue logic game."""
 
+import io
+import sys
+
 from clue_models import DEFAULT_CONFIG
 from generate_clue_game import (
     create_game,
     generate_game_until_unique_solution,
     setup_scenario,
 )
-from solver import check_solution_count
+from solver import add_knowledge, check_solution_count, is_entailed
 from ui import print_propositions, print_scenario
 
 
@@ -45,6 +48,30 @@ def test_generate_and_solve_game():
     return True
 
 
+def test_skip_redundant_games(num_games: int = 10, seed_start: int = 0):
+    """Test that skipping already-implied propositions still converges."""
+    for seed in range(seed_start, seed_start + num_games):
+        game = create_game(DEFAULT_CONFIG, seed=seed)
+        setup_scenario(game)
+        identified_killer = generate_game_until_unique_solution(
+            game, verbose=False, skip_redundant=True
+        )
+
+        count, possible_killers = check_solution_count(game)
+        assert count == 1, f"Seed {seed}: expected 1 possible killer, got {count}"
+        assert identified_killer == game.killer == possible_killers[0], (
+            f"Seed {seed}: identified {identified_killer}, actual {game.killer}"
+        )
+        # Replay the game: no proposition is implied by the ones before it
+        replay = create_game(DEFAULT_CONFIG, seed=seed)
+        setup_scenario(replay)
+        for proposition_expr, prop_data in game.propositions:
+            assert not is_entailed(replay, proposition_expr), (
+                f"Seed {seed}: redundant proposition {prop_data}"
+            )
+            add_knowledge(replay, proposition_expr)
+
+
 def test_batch_games(num_games: int = 10, seed_start: int = 0):
     """Test multiple game generations."""
     print(f"\n{'=' * 60}")
@@ -56,18 +83,20 @@ def test_batch_games(num_games: int = 10, seed_start: int = 0):
     proposition_counts = []
 
     for i in range(num_games):
-        print(f"Game {i + 1}/{num_games}:")
+        # Collect each game's output and write it in one go
+        buf = io.StringIO()
+        print(f"Game {i + 1}/{num_games}:", file=buf)
 
         # Create and setup game
         game = create_game(DEFAULT_CONFIG, seed=seed_start + i)
         setup_scenario(game)
-        print_scenario(game)
+        print_scenario(game, file=buf)
 
         # Generate propositions until unique solution
         identified_killer = generate_game_until_unique_solution(game, verbose=False)
 
         # Print the propositions for this game
-        print_propositions(game, verbose=False)
+        print_propositions(game, verbose=False, file=buf)
 
         # Verify the solution
         count, possible_killers = check_solution_count(game)
@@ -75,20 +104,23 @@ def test_batch_games(num_games: int = 10, seed_start: int = 0):
         # Check assertions
         if count != 1:
             print(
-                f"  ❌ FAILED: Expected 1 possible killer, got {count}: {possible_killers}"
+                f"  ❌ FAILED: Expected 1 possible killer, got {count}: {possible_killers}",
+                file=buf,
             )
             all_passed = False
         elif identified_killer != game.killer:
             print(
-                f"  ❌ FAILED: Identified {identified_killer} but actual killer is {game.killer}"
+                f"  ❌ FAILED: Identified {identified_killer} but actual killer is {game.killer}",
+                file=buf,
             )
             all_passed = False
         else:
-            print(f"  ✅ PASSED: Correctly identified {game.killer}")
+            print(f"  ✅ PASSED: Correctly identified {game.killer}", file=buf)
             correct_count += 1
 
         proposition_counts.append(len(game.propositions))
-        print(f"     Propositions: {len(game.propositions)}\n")
+        print(f"     Propositions: {len(game.propositions)}\n", file=buf)
+        sys.stdout.write(buf.getvalue())
 
     # Summary
     print(f"{'=' * 60}")
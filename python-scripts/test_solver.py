@@ -0,0 +1,127 @@
+"""Unit tests for the CNF encoding and evaluation helpers in solver."""
+
+import itertools
+import random
+
+import pytest
+from sympy import And, Implies, Not, Or, symbols
+from sympy.logic.boolalg import BooleanAtom
+
+from clue_models import DEFAULT_CONFIG
+from generate_clue_game import create_game, setup_scenario
+from solver import at_most_one_clauses, evaluate, expr_to_clauses
+
+a, b, c, d = SYMBOLS = symbols("a b c d")
+VARIABLES = {sym: i for i, sym in enumerate(SYMBOLS, start=1)}
+
+
+def clauses_hold(clauses, true_vars):
+    """Evaluate DIMACS clauses under the assignment where true_vars are true."""
+    return all(any((lit > 0) == (abs(lit) in true_vars) for lit in c) for c in clauses)
+
+
+def assert_matches_truth_table(expr):
+    """Check expr_to_clauses (both polarities) and evaluate on every assignment."""
+    clauses = expr_to_clauses(expr, VARIABLES)
+    negated = expr_to_clauses(expr, VARIABLES, negate=True)
+    for values in itertools.product([False, True], repeat=len(SYMBOLS)):
+        assignment = dict(zip(SYMBOLS, values))
+        expected = bool(expr.xreplace(assignment))
+        true_symbols = {sym for sym, value in assignment.items() if value}
+        true_vars = {VARIABLES[sym] for sym in true_symbols}
+
+        assert clauses_hold(clauses, true_vars) == expected, (expr, assignment)
+        assert clauses_hold(negated, true_vars) == (not expected), (expr, assignment)
+        assert evaluate(expr, true_symbols) == expected, (expr, assignment)
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        a,
+        Not(a),
+        Implies(a, b),
+        Not(Implies(a, Not(b))),
+        Implies(Or(a, b), And(c, Not(d))),
+        Or(a, And(b, c)),
+        Or(Not(a), Not(b)),
+        And(a, Not(b)),
+        Not(And(a, Or(b, Not(c)))),
+        Not(Or(And(a, b), Not(And(c, d)))),
+        Or(And(a, b), And(c, d)),
+        Or(a, And(Not(a), b)),
+    ],
+)
+def test_matches_truth_table(expr):
+    assert_matches_truth_table(expr)
+
+
+def random_expr(rng, depth):
+    """Build a random Symbol/Not/And/Or/Implies expression."""
+    if depth == 0 or rng.random() < 0.25:
+        return rng.choice(SYMBOLS)
+    op = rng.choice(["not", "and", "or", "implies"])
+    if op == "not":
+        return Not(random_expr(rng, depth - 1))
+    if op == "implies":
+        return Implies(random_expr(rng, depth - 1), random_expr(rng, depth - 1))
+    args = [random_expr(rng, depth - 1) for _ in range(rng.randint(2, 3))]
+    return And(*args) if op == "and" else Or(*args)
+
+
+def test_matches_truth_table_random():
+    rng = random.Random(0)
+    checked = 0
+    while checked < 200:
+        expr = random_expr(rng, depth=4)
+        # sympy folds some random formulas to true/false; those never occur
+        # as propositions
+        if isinstance(expr, BooleanAtom):
+            continue
+        assert_matches_truth_table(expr)
+        checked += 1
+
+
+def test_tautological_clauses_are_dropped():
+    # a | (~a & b) distributes to (a | ~a) & (a | b); the first is always true
+    assert expr_to_clauses(Or(a, And(Not(a), b)), VARIABLES) == [(1, 2)]
+    # ~(a & (~a | b)) is ~a | (a & ~b): (~a | a) & (~a | ~b)
+    assert expr_to_clauses(And(a, Or(Not(a), b)), VARIABLES, negate=True) == [(-1, -2)]
+
+
+def test_repeated_literals_are_merged():
+    assert expr_to_clauses(Or(a, And(a, b)), VARIABLES) == [(1,), (1, 2)]
+
+
+@pytest.mark.parametrize("n", range(7))
+def test_at_most_one_clauses_matches_pairwise(n):
+    """Brute-force the sequential counter against the pairwise encoding."""
+    variables = list(range(1, n + 1))
+    clauses = at_most_one_clauses(variables, first_aux=n + 1)
+    num_aux = max(n - 1, 0)
+    assert all(abs(lit) <= n + num_aux for clause in clauses for lit in clause)
+
+    for values in itertools.product([False, True], repeat=n):
+        true_vars = {var for var, value in zip(variables, values) if value}
+        pairwise = len(true_vars) <= 1
+        # The counter holds iff some setting of the auxiliary variables works
+        satisfiable = any(
+            clauses_hold(
+                clauses,
+                true_vars | {n + 1 + i for i, aux_value in enumerate(aux) if aux_value},
+            )
+            for aux in itertools.product([False, True], repeat=num_aux)
+        )
+        assert satisfiable == pairwise, (n, true_vars)
+
+
+def test_knowledge_base_records_exactly_one_killer():
+    game = create_game(DEFAULT_CONFIG, seed=0)
+    setup_scenario(game)
+    killers = [game.symbols_map[f"{name}_is_killer"] for name in game.names]
+
+    at_least_one, at_most_one = game.knowledge_base
+    for values in itertools.product([False, True], repeat=len(killers)):
+        true_symbols = {sym for sym, value in zip(killers, values) if value}
+        assert evaluate(at_least_one, true_symbols) == (len(true_symbols) >= 1)
+        assert evaluate(at_most_one, true_symbols) == (len(true_symbols) <= 1)
@@ -1,61 +1,62 @@
 """UI rendering functions for Clue game propositions."""
 
+from collections.abc import Callable
+from typing import TextIO
+
 from clue_models import ClueGame, PropositionData, PropositionType
 
+# One renderer per proposition type, looked up by render_proposition
+PROPOSITION_RENDERERS: dict[PropositionType, Callable[[PropositionData], str]] = {
+    PropositionType.PERSON_AND_ATTRIBUTE: lambda p: f"{p.person} was with {p.value}",
+    PropositionType.PERSON_OR_PERSON: lambda p: (
+        f"({p.person1} with {p.val1}) OR ({p.person2} with {p.val2})"
+    ),
+    PropositionType.PERSON_ATTRIBUTE_IMPLIES_NOT_KILLER: lambda p: (
+        f"If {p.person} was with {p.value}, then {p.person} is not the killer"
+    ),
+    PropositionType.COMPLEX_OR: lambda p: (
+        f"({p.person1} with {p.mat1}) OR ({p.person2} with {p.food2} and {p.inst2})"
+    ),
+    PropositionType.DIRECT_ELIMINATION: lambda p: (
+        f"{p.person} was with {p.value} (alibi: not the killer)"
+    ),
+}
+
 
 def render_proposition(prop_data: PropositionData) -> str:
     """Render a proposition to a human-readable string."""
-    if prop_data.prop_type == PropositionType.PERSON_AND_ATTRIBUTE:
-        return f"{prop_data.person} was with {prop_data.value}"
-
-    elif prop_data.prop_type == PropositionType.PERSON_OR_PERSON:
-        return (
-            f"({prop_data.person1} with {prop_data.val1}) OR "
-            f"({prop_data.person2} with {prop_data.val2})"
-        )
+    renderer = PROPOSITION_RENDERERS.get(prop_data.prop_type)
+    if renderer is None:
+        return f"Unknown proposition type: {prop_data.prop_type}"
+    return renderer(prop_data)
 
-    elif prop_data.prop_type == PropositionType.PERSON_ATTRIBUTE_IMPLIES_NOT_KILLER:
-        return (
-            f"If {prop_data.person} was with {prop_data.value}, "
-            f"then {prop_data.person} is not the killer"
-        )
 
-    elif prop_data.prop_type == PropositionType.COMPLEX_OR:
-        return (
-            f"({prop_data.person1} with {prop_data.mat1}) OR "
-            f"({prop_data.person2} with {prop_data.food2} and {prop_data.inst2})"
-        )
-
-    elif prop_data.prop_type == PropositionType.DIRECT_ELIMINATION:
-        return f"{prop_data.person} was with {prop_data.value} (alibi: not the killer)"
-
-    return f"Unknown proposition type: {prop_data.prop_type}"
-
-
-def print_scenario(game: ClueGame) -> None:
-    """Print the game scenario."""
-    print(f"🎯 Ground truth: {game.killer} is the killer")
-    print("🔍 Full scenario:")
+def print_scenario(game: ClueGame, file: TextIO | None = None) -> None:
+    """Print the game scenario (to file, or stdout by default)."""
+    print(f"🎯 Ground truth: {game.killer} is the killer", file=file)
+    print("🔍 Full scenario:", file=file)
     for name, activity in game.ground_truth.items():
         marker = "🔪" if name == game.killer else "✅"
-        print(f"  {marker} {name}: {activity.model_dump()}")
-    print()
+        print(f"  {marker} {name}: {activity.model_dump()}", file=file)
+    print(file=file)
 
 
-def print_propositions(game: ClueGame, verbose: bool = True) -> None:
+def print_propositions(
+    game: ClueGame, verbose: bool = True, file: TextIO | None = None
+) -> None:
     """Print all propositions in the game with their descriptions."""
     if not game.propositions:
-        print("No propositions yet.")
+        print("No propositions yet.", file=file)
         return
 
-    print(f"\n📜 Propositions ({len(game.propositions)} total):")
-    for i, (_, prop_data) in enumerate(game.propositions, 1):
-        desc = render_proposition(prop_data)
-        if verbose:
-            print(f"  {i}. {desc}")
-        else:
-            # Just show the count
-            pass
-
-    if not verbose:
-        print(f"  ({len(game.propositions)} propositions)")
+    count = len(game.propositions)
+    lines = [f"\n📜 Propositions ({count} total):"]
+    if verbose:
+        lines.extend(
+            f"  {i}. {render_proposition(prop_data)}"
+            for i, (_, prop_data) in enumerate(game.propositions, 1)
+        )
+    else:
+        # Just show the count
+        lines.append(f"  ({count} propositions)")
+    print("\n".join(lines), file=file)